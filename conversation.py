@@ -0,0 +1,114 @@
+"""
+Memori percakapan per sesi untuk prompt chat.
+
+Setiap giliran chat membawa giliran terbaru dari riwayat apa adanya, sedangkan
+giliran yang lebih lama dipadatkan menjadi satu ringkasan bergulir. Ringkasan
+hanya dibuat ulang bila riwayat yang belum diringkas melewati ambang token,
+sehingga panggilan AI tambahan jarang terjadi dan ukuran prompt per giliran
+tetap terbatas berapa pun panjang percakapannya. Modul ini tidak bergantung
+pada model ORM di app.py; pemanggil menyediakan giliran dan ringkasannya.
+"""
+from dataclasses import dataclass, field
+from typing import List, Sequence
+
+from retrieval import estimate_tokens
+
+USER_LABEL = "Pengguna"
+ASSISTANT_LABEL = "Asisten"
+
+
+def clip_text(text: str, max_tokens: int) -> str:
+    """Memotong teks agar kira-kira tidak melebihi max_tokens token."""
+    tokens = estimate_tokens(text)
+    if tokens <= max_tokens:
+        return text
+    # Potong sebanding jumlah token, lalu perkecil lagi bila perkiraannya masih lebih
+    length = len(text) * max_tokens // tokens
+    while length > 0 and estimate_tokens(text[:length]) > max_tokens:
+        length = length * 9 // 10
+    return text[:length].rstrip() + " ..."
+
+
+@dataclass(frozen=True)
+class Turn:
+    """Satu giliran tanya-jawab dari riwayat chat, sudah dipotong ke batas token per giliran."""
+    id: int
+    message: str
+    response: str
+    tokens: int
+
+    @classmethod
+    def from_history(cls, history_id: int, message: str, response: str, max_tokens: int) -> "Turn":
+        message = clip_text(message, max_tokens // 2)
+        response = clip_text(response, max_tokens - estimate_tokens(message))
+        return cls(history_id, message, response, estimate_tokens(render_turns([cls(history_id, message, response, 0)])))
+
+
+@dataclass
+class ConversationWindow:
+    """
+    Bagian percakapan yang masuk ke prompt satu giliran.
+
+    Attributes:
+        summary: Ringkasan bergulir giliran lama (kosong bila belum ada)
+        turns: Giliran terbaru yang disertakan apa adanya, dari yang terlama
+        to_summarize: Giliran yang perlu dipadatkan ke ringkasan setelah giliran ini, dari yang terlama
+    """
+    summary: str = ""
+    turns: List[Turn] = field(default_factory=list)
+    to_summarize: List[Turn] = field(default_factory=list)
+
+    def render(self) -> str:
+        """Teks memori untuk prompt; kosong bila belum ada percakapan."""
+        parts = []
+        if self.summary:
+            parts.append(f"Ringkasan percakapan sebelumnya:\n{self.summary}\n")
+        if self.turns:
+            parts.append(f"Percakapan terakhir:\n{render_turns(self.turns)}")
+        return "\n".join(parts)
+
+
+def render_turns(turns: Sequence[Turn]) -> str:
+    return "".join(f"{USER_LABEL}: {turn.message}\n{ASSISTANT_LABEL}: {turn.response}\n" for turn in turns)
+
+
+def select_window(summary: str, turns: Sequence[Turn], recent_tokens: int) -> ConversationWindow:
+    """
+    Memilih giliran yang disertakan di prompt dan giliran yang perlu diringkas.
+
+    Giliran terbaru yang muat dalam recent_tokens disertakan apa adanya. Bila
+    seluruh giliran yang belum diringkas melebihi recent_tokens, giliran lama
+    dipadatkan sampai yang tersisa hanya separuh anggaran, agar ringkasan tidak
+    dibuat ulang di setiap giliran berikutnya.
+
+    Args:
+        summary: Ringkasan yang sudah tersimpan untuk sesi
+        turns: Giliran yang belum tercakup ringkasan, dari yang terbaru
+        recent_tokens: Batas token giliran yang disertakan apa adanya
+    """
+    window = ConversationWindow(summary=summary)
+    used = 0
+    keep_after_summary = 0
+    for turn in turns:
+        if used + turn.tokens > recent_tokens:
+            break
+        used += turn.tokens
+        window.turns.append(turn)
+        if used <= recent_tokens // 2:
+            keep_after_summary += 1
+    window.turns.reverse()
+
+    if sum(turn.tokens for turn in turns) > recent_tokens:
+        window.to_summarize = list(reversed(turns[keep_after_summary:]))
+    return window
+
+
+def build_summary_prompt(summary: str, turns: Sequence[Turn], max_words: int) -> str:
+    """Prompt untuk memadatkan ringkasan lama dan giliran baru menjadi satu ringkasan."""
+    previous = f"Ringkasan sebelumnya:\n{summary}\n\n" if summary else ""
+    return (
+        "Padatkan percakapan antara pengguna dan asisten dokumen berikut menjadi satu ringkasan "
+        f"dalam bahasa Indonesia, paling banyak {max_words} kata. Pertahankan nama dokumen, nama orang, "
+        "tanggal, angka, dan pertanyaan yang belum terjawab. Tulis ringkasannya saja tanpa pembuka.\n\n"
+        f"{previous}Percakapan baru:\n{render_turns(turns)}"
+    )
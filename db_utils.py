@@ -1,13 +1,47 @@
 """
 Utilitas untuk mengelola koneksi database dengan lebih baik.
+
+Keaktifan koneksi dalam pool diperiksa dengan satu strategi yang bisa dipilih:
+
+- "pre_ping": setiap checkout menjalankan ping ringan (satu round trip) dan
+  koneksi yang putus diganti sebelum dipakai.
+- "recycle": tanpa ping; koneksi diganti setelah pool_recycle detik (atur di
+  bawah wait_timeout server), dan query pertama sebuah transaksi yang gagal
+  karena koneksi putus diulang sekali dengan koneksi baru (lihat
+  OptimisticRetrySession).
+
+Siklus hidup pool per proses worker: engine yang ikut tersalin saat proses
+di-fork (misalnya gunicorn --preload) melepaskan koneksi milik induknya tanpa
+menutupnya, koneksi MySQL diberi wait_timeout sedikit di atas pool_recycle
+sehingga server sendiri yang menutup koneksi yang ditinggalkan worker mati,
+dan saat berhenti pool dikuras (menunggu koneksi yang sedang dipakai kembali)
+sebelum ditutup. Tidak ada worker yang menutup koneksi worker lain.
+
+Event pool dicatat lewat logger "db_utils" pada level DEBUG.
 """
+import logging
+import os
 import time
-import pymysql
-from sqlalchemy import create_engine, event
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.pool import QueuePool
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool
 
-def setup_database_engine(database_url, pool_size=10, max_overflow=20, pool_timeout=30):
+logger = logging.getLogger(__name__)
+
+LIVENESS_STRATEGIES = ("pre_ping", "recycle")
+
+def setup_database_engine(
+    database_url,
+    pool_size=10,
+    max_overflow=20,
+    pool_timeout=30,
+    pool_recycle=3600,
+    liveness="pre_ping",
+    server_idle_timeout=None,
+    on_checkout_wait=None,
+    **engine_options
+):
     """
     Membuat dan mengkonfigurasi engine database dengan penanganan koneksi yang lebih baik.
     
@@ -16,115 +50,198 @@ def setup_database_engine(database_url, pool_size=10, max_overflow=20, pool_time
         pool_size: Jumlah maksimum koneksi dalam pool
         max_overflow: Jumlah maksimum koneksi yang bisa dibuat melebihi pool_size
         pool_timeout: Timeout untuk mendapatkan koneksi dari pool (detik)
+        pool_recycle: Umur maksimum koneksi (detik) sebelum diganti dengan yang baru
+        liveness: Strategi pemeriksaan koneksi, "pre_ping" atau "recycle"
+        server_idle_timeout: wait_timeout sesi MySQL (detik) untuk setiap koneksi baru;
+            sebaiknya sedikit di atas pool_recycle. None berarti memakai setelan server
+        on_checkout_wait: Callback (detik) yang dipanggil setiap kali koneksi diambil dari pool,
+            berisi lama menunggu koneksi (termasuk membuka koneksi baru); untuk metrik
+        **engine_options: Opsi tambahan untuk create_engine (misalnya connect_args)
         
     Returns:
         SQLAlchemy engine yang sudah dikonfigurasi
     """
+    if liveness not in LIVENESS_STRATEGIES:
+        raise ValueError(f"Strategi liveness tidak valid: '{liveness}' (pilihan: {', '.join(LIVENESS_STRATEGIES)})")
+
+    poolclass = QueuePool
+    if on_checkout_wait is not None:
+        # Event "checkout" baru terpanggil setelah koneksi didapat, jadi waktu tunggu
+        # diukur langsung di sekitar pengambilan koneksi dari antrean pool
+        class TimedQueuePool(QueuePool):
+            def _do_get(self):
+                started = time.perf_counter()
+                try:
+                    return super()._do_get()
+                finally:
+                    on_checkout_wait(time.perf_counter() - started)
+
+        poolclass = TimedQueuePool
+
     engine = create_engine(
         database_url,
-        poolclass=QueuePool,
+        poolclass=poolclass,
         pool_size=pool_size,
         max_overflow=max_overflow,
         pool_timeout=pool_timeout,
-        pool_recycle=3600,  # Recycle koneksi setiap 1 jam
-        pool_pre_ping=True  # Verifikasi koneksi sebelum digunakan
+        pool_recycle=pool_recycle,
+        pool_pre_ping=liveness == "pre_ping",
+        **engine_options
     )
     
-    # Event listener untuk menangani koneksi yang dibuat
+    # Hanya event yang jarang terjadi (koneksi dibuka, ditutup, atau dibuang) yang dicatat;
+    # checkout/checkin terjadi di setiap request sehingga tidak diberi listener
     @event.listens_for(engine, "connect")
     def connect(dbapi_connection, connection_record):
-        print("Database connection established")
+        if server_idle_timeout and engine.dialect.name == "mysql":
+            cursor = dbapi_connection.cursor()
+            cursor.execute(f"SET SESSION wait_timeout = {int(server_idle_timeout)}")
+            cursor.close()
+        logger.debug("db_pool event=connect pid=%d checked_out=%d", os.getpid(), engine.pool.checkedout())
         
-    # Event listener untuk menangani koneksi yang ditutup
     @event.listens_for(engine, "close")
     def close(dbapi_connection, connection_record):
-        print("Database connection closed")
-    
-    # Event listener untuk menangani koneksi yang gagal
-    @event.listens_for(engine, "checkout")
-    def checkout(dbapi_connection, connection_record, connection_proxy):
-        try:
-            # Verifikasi bahwa koneksi masih hidup
-            cursor = dbapi_connection.cursor()
-            cursor.execute("SELECT 1")
-            cursor.close()
-        except pymysql.err.OperationalError as e:
-            # Jika koneksi mati, coba buat koneksi baru
-            if e.args[0] in (2006, 2013, 2055):  # MySQL server has gone away, Lost connection, etc.
-                print("Connection was invalid. Creating new connection...")
-                connection_record.connection = None
-                raise SQLAlchemyError("Connection was invalid")
+        logger.debug("db_pool event=close checked_out=%d", engine.pool.checkedout())
+
+    @event.listens_for(engine, "invalidate")
+    def invalidate(dbapi_connection, connection_record, exception):
+        logger.debug("db_pool event=invalidate error=%r", exception)
+
+    # Proses anak hasil fork membuat koneksinya sendiri; koneksi induk tidak ditutup
+    # dari sini karena masih dipakai induknya (tidak tersedia di Windows)
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=lambda: engine.dispose(close=False))
     
     return engine
 
-def check_mysql_connection(host='localhost', user='k_arpus', password='12345', port=3307, database='data_arpus'):
+def pool_status(engine):
+    """
+    Statistik pool engine di proses ini untuk endpoint diagnostik.
+
+    Returns:
+        Dict berisi pid, kelas pool, dan (untuk QueuePool) ukuran, koneksi yang
+        sedang dipakai/menganggur, overflow, timeout, dan recycle
+    """
+    pool = engine.pool
+    status = {"pid": os.getpid(), "pool_class": type(pool).__name__, "dialect": engine.dialect.name}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(0, pool.overflow()),
+            "max_overflow": pool._max_overflow,
+            "timeout_seconds": pool.timeout(),
+            "recycle_seconds": pool._recycle,
+            "pre_ping": pool._pre_ping,
+        })
+    return status
+
+def drain_engine(engine, timeout=10.0, poll_interval=0.1):
     """
-    Memeriksa koneksi MySQL dan menampilkan daftar proses yang berjalan.
-    Berguna untuk debugging koneksi yang menggantung.
+    Menunggu koneksi yang sedang dipakai kembali ke pool (paling lama `timeout` detik),
+    lalu menutup semua koneksi. Dipanggil saat aplikasi berhenti.
+
+    Returns:
+        Jumlah koneksi yang masih dipakai saat pool ditutup (0 jika semua sempat kembali)
     """
+    pool = engine.pool
+    deadline = time.monotonic() + timeout
+    remaining = pool.checkedout() if isinstance(pool, QueuePool) else 0
+    while remaining and time.monotonic() < deadline:
+        time.sleep(poll_interval)
+        remaining = pool.checkedout()
+    engine.dispose()
+    return remaining
+
+def check_database_connection(database_url):
+    """
+    Memeriksa apakah database dapat dihubungi dengan satu koneksi sementara (tanpa pool).
+    Dipakai oleh start_app.bat sebelum aplikasi dijalankan.
+    """
+    engine = create_engine(database_url, poolclass=NullPool)
     try:
-        conn = pymysql.connect(
-            host=host,
-            user=user,
-            password=password,
-            port=port,
-            database=database,
-            connect_timeout=5
-        )
-        
-        with conn.cursor() as cursor:
-            cursor.execute("SHOW PROCESSLIST")
-            processes = cursor.fetchall()
-            
-            print(f"Total koneksi aktif: {len(processes)}")
-            print("Daftar proses:")
-            for process in processes:
-                print(f"ID: {process[0]}, User: {process[1]}, Host: {process[2]}, DB: {process[3]}, Command: {process[4]}, Time: {process[5]}, State: {process[6]}")
-                
-        conn.close()
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
         return True
     except Exception as e:
-        print(f"Error saat memeriksa koneksi MySQL: {e}")
+        print(f"Error saat memeriksa koneksi database: {e}")
         return False
+    finally:
+        engine.dispose()
 
-def cleanup_mysql_connections(host='localhost', user='k_arpus', password='12345', port=3307, database='data_arpus'):
+class OptimisticRetrySession(Session):
     """
-    Membersihkan koneksi MySQL yang menggantung (sleep lebih dari 100 detik).
+    Session untuk strategi "recycle": jika query pertama sebuah transaksi gagal karena
+    koneksi terputus, SQLAlchemy membuang koneksi itu (dan koneksi lain yang lebih tua
+    di pool), lalu query diulang sekali dengan koneksi baru. Query berikutnya dalam
+    transaksi yang sama tidak diulang karena pekerjaan sebelumnya sudah hilang.
     """
-    try:
-        conn = pymysql.connect(
-            host=host,
-            user=user,
-            password=password,
-            port=port,
-            database=database,
-            connect_timeout=5
-        )
-        
-        with conn.cursor() as cursor:
-            # Cari koneksi yang sleep lebih dari 100 detik
-            cursor.execute("SHOW PROCESSLIST")
-            processes = cursor.fetchall()
-            
-            killed_count = 0
-            for process in processes:
-                process_id = process[0]
-                command = process[4]
-                time_sec = process[5]
-                
-                # Jika koneksi dalam status Sleep dan sudah lebih dari 100 detik
-                if command == "Sleep" and time_sec > 100:
-                    try:
-                        cursor.execute(f"KILL {process_id}")
-                        killed_count += 1
-                        print(f"Killed connection ID: {process_id} (Sleep for {time_sec} seconds)")
-                    except Exception as e:
-                        print(f"Failed to kill connection {process_id}: {e}")
-            
-            print(f"Total koneksi yang dibersihkan: {killed_count}")
-                
-        conn.close()
-        return killed_count
-    except Exception as e:
-        print(f"Error saat membersihkan koneksi MySQL: {e}")
-        return 0
\ No newline at end of file
+
+    def execute(self, *args, **kwargs):
+        fresh = not self.in_transaction()
+        try:
+            return super().execute(*args, **kwargs)
+        except DBAPIError as e:
+            if not (fresh and e.connection_invalidated):
+                raise
+            logger.debug("db_pool event=retry_after_disconnect error=%r", e.orig)
+            self.rollback()
+            return super().execute(*args, **kwargs)
+
+def create_session_factory(engine, liveness="pre_ping", **session_options):
+    """
+    Membuat sessionmaker untuk engine sesuai strategi liveness-nya.
+
+    Args:
+        engine: Engine dari setup_database_engine
+        liveness: Strategi yang sama dengan yang dipakai untuk engine
+        **session_options: Opsi sessionmaker (misalnya autoflush=False)
+    """
+    session_class = OptimisticRetrySession if liveness == "recycle" else Session
+    return sessionmaker(bind=engine, class_=session_class, **session_options)
+
+def sync_schema(engine, metadata):
+    """
+    Membuat tabel yang belum ada, lalu menambahkan kolom dan indeks baru pada
+    tabel lama. create_all() saja tidak mengubah tabel yang sudah ada, sehingga
+    fungsi ini berperan sebagai migrasi sederhana tanpa Alembic.
+
+    Args:
+        engine: SQLAlchemy engine
+        metadata: MetaData berisi definisi model (Base.metadata)
+
+    Returns:
+        Daftar perubahan yang diterapkan, misalnya ["documents.status"]
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    metadata.create_all(bind=engine)
+
+    applied = []
+    with engine.begin() as conn:
+        for table in metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue  # Baru dibuat lengkap oleh create_all
+
+            existing_columns = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(engine.dialect)}"
+                if column.server_default is not None:
+                    ddl += f" DEFAULT '{column.server_default.arg}'"
+                    if not column.nullable:
+                        ddl += " NOT NULL"
+                conn.execute(text(ddl))
+                applied.append(f"{table.name}.{column.name}")
+
+            existing_indexes = {ix["name"] for ix in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(conn)
+                    applied.append(f"{table.name}.{index.name}")
+
+    for change in applied:
+        print(f"Migrasi skema diterapkan: {change}")
+    return applied
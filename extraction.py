@@ -0,0 +1,484 @@
+"""
+Utilitas ekstraksi teks dari dokumen yang diunggah (PDF, DOCX, DOC, TXT).
+
+Modul ini sengaja tidak bergantung pada app.py (database, konfigurasi FastAPI)
+agar fungsi-fungsinya dapat dijalankan di proses worker terpisah.
+"""
+import csv
+import io
+import shutil
+import subprocess
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import docx
+import fitz  # PyMuPDF
+from docx.oxml.ns import qn
+
+from ocr import OcrPageCache, ocr_pdf_pages, page_needs_ocr
+from retrieval import chunk_document
+
+
+@dataclass
+class ExtractionOptions:
+    """
+    Opsi ekstraksi yang dikirim ke proses worker (harus dapat di-pickle).
+
+    Attributes:
+        chunk_max_tokens: Ukuran maksimum chunk untuk indeks retrieval
+        pdf_page_workers: Jumlah proses untuk membagi halaman PDF (1 = serial)
+        table_detection: "ruled" (hanya halaman yang memiliki garis), "always", atau "never"
+        table_format: "markdown" atau "csv" (header sekali per tabel), atau "sentences" (kalimat per sel)
+        ocr_enabled: Jalankan OCR untuk halaman pindaian (tanpa lapisan teks)
+        ocr_language: Bahasa Tesseract, misalnya "ind+eng"
+        ocr_dpi: Resolusi render halaman untuk OCR
+        ocr_workers: Jumlah proses OCR per PDF
+        ocr_min_chars: Halaman bergambar dengan teks kurang dari ini dianggap pindaian
+        ocr_cache_dir: Folder cache OCR per halaman (None = tanpa cache)
+        doc_converter: Perintah LibreOffice untuk mengonversi .doc ke .docx
+        doc_convert_timeout: Batas waktu konversi .doc (detik)
+        content_hash: SHA-256 file yang sudah dihitung saat unggah, dipakai sebagai kunci cache OCR
+            (None = dihitung ulang dari file)
+    """
+    chunk_max_tokens: int = 350
+    pdf_page_workers: int = 1
+    table_detection: str = "ruled"
+    table_format: str = "markdown"
+    ocr_enabled: bool = True
+    ocr_language: str = "ind+eng"
+    ocr_dpi: int = 300
+    ocr_workers: int = 1
+    ocr_min_chars: int = 20
+    ocr_cache_dir: Optional[str] = None
+    doc_converter: str = "soffice"
+    doc_convert_timeout: int = 120
+    content_hash: Optional[str] = None
+
+
+TABLE_FORMATS = ("markdown", "csv", "sentences")
+
+# Halaman PDF per worker minimum; di bawah ini overhead proses lebih besar dari manfaatnya
+MIN_PAGES_PER_WORKER = 8
+
+
+def _page_has_ruling_lines(page) -> bool:
+    """
+    Memeriksa apakah halaman memiliki garis/persegi vektor. Strategi default
+    find_tables() ("lines") hanya menemukan tabel bergaris, sehingga halaman
+    tanpa garis dapat dilewati tanpa mengubah hasil.
+    """
+    for drawing in page.get_drawings():
+        for item in drawing["items"]:
+            if item[0] in ("l", "re", "qu"):
+                return True
+    return False
+
+
+def _clean_cell(cell) -> str:
+    return str(cell).replace('\n', ' ').strip() if cell is not None else ""
+
+
+def format_table(table_data: List[list], table_num: int, table_format: str = "markdown") -> str:
+    """
+    Mengubah data tabel (baris pertama = header) menjadi teks untuk AI.
+
+    Format "markdown" dan "csv" menulis header sekali, dan penanda awalnya
+    menyebut formatnya (misalnya "[Mulai Data Tabel 1 (markdown)]") agar
+    chunk_document dapat mengulang header di setiap chunk tabel. Format
+    "sentences" menulis setiap baris sebagai kalimat "Kolom adalah 'nilai'".
+
+    Returns:
+        Teks tabel lengkap dengan penanda awal dan akhir, atau "" jika tabel hanya punya header
+    """
+    if not table_data or len(table_data) < 2:
+        return "" # Lompati jika tabel kosong atau hanya punya header
+
+    # Ambil header dan bersihkan dari karakter newline
+    header = [_clean_cell(h) for h in table_data[0]]
+
+    if table_format == "sentences":
+        parts = [f"\n[Mulai Data Tabel {table_num}]\n"]
+        for row_idx, row in enumerate(table_data[1:]):
+            cell_descriptions = []
+            for col_idx, cell in enumerate(row):
+                # Pastikan tidak error jika header lebih pendek dari baris
+                if col_idx < len(header) and header[col_idx]:
+                    cell_text = _clean_cell(cell) if cell is not None else "kosong"
+                    # Buat pasangan kunci-nilai yang jelas
+                    cell_descriptions.append(f"{header[col_idx]} adalah '{cell_text}'")
+            parts.append(f"Informasi dari baris {row_idx + 1} pada tabel adalah: " + ", ".join(cell_descriptions) + ".\n")
+        parts.append(f"[Akhir Data Tabel {table_num}]\n")
+        return "".join(parts)
+
+    width = max(len(row) for row in table_data)
+    header = [h or f"Kolom {i + 1}" for i, h in enumerate(header + [""] * (width - len(header)))]
+    rows = [[_clean_cell(cell) for cell in row] + [""] * (width - len(row)) for row in table_data[1:]]
+
+    if table_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(header)
+        writer.writerows(rows)
+        body = buffer.getvalue()
+    else:
+        def md_row(cells):
+            return "| " + " | ".join(cell.replace("|", "\\|") for cell in cells) + " |\n"
+        body = md_row(header) + "|" + " --- |" * width + "\n" + "".join(md_row(row) for row in rows)
+    return f"\n[Mulai Data Tabel {table_num} ({table_format})]\n{body}[Akhir Data Tabel {table_num}]\n"
+
+
+def _extract_pdf_page(page, page_num: int, table_detection: str = "ruled", ocr_min_chars: int = 0, table_format: str = "markdown") -> Dict[str, Any]:
+    """
+    Mengekstrak teks dan tabel satu halaman PDF menjadi format deskriptif.
+
+    Returns:
+        Dict berisi "page" (nomor halaman mulai 1), "text", "needs_ocr", dan "extract_ms"
+    """
+    started = time.perf_counter()
+    # 1. Ekstrak teks biasa dari halaman
+    page_text = page.get_text("text")
+    parts = [f"\n--- Teks dari Halaman {page_num + 1} ---\n", page_text]
+
+    # 2. Cari semua tabel di halaman (dilewati jika halaman tidak memiliki garis)
+    detect = table_detection == "always" or (table_detection == "ruled" and _page_has_ruling_lines(page))
+    tables = page.find_tables().tables if detect else []
+
+    if tables:
+        parts.append(f"\n\n--- Tabel Ditemukan di Halaman {page_num + 1} ---\n")
+        for i, table in enumerate(tables):
+            try:
+                # 3. Ekstrak data dari struktur tabel yang ditemukan, lalu ubah ke format teks
+                parts.append(format_table(table.extract(), i + 1, table_format))
+            except Exception as e:
+                print(f"Gagal memproses tabel {i+1} di halaman {page_num+1}: {e}")
+
+    parts.append("\n--- Akhir Halaman ---\n")
+    return {
+        "page": page_num + 1,
+        "text": "".join(parts),
+        "needs_ocr": page_needs_ocr(page, page_text, ocr_min_chars),
+        "extract_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def _extract_pdf_page_range(file_path: str, start: int, stop: int, table_detection: str = "ruled", ocr_min_chars: int = 0, table_format: str = "markdown") -> List[Dict[str, Any]]:
+    """
+    Mengekstrak halaman [start, stop) dari sebuah PDF. Dijalankan di proses worker;
+    setiap worker membuka file sendiri karena objek fitz tidak dapat dibagi antarproses.
+    """
+    with fitz.open(file_path) as doc:
+        return [_extract_pdf_page(doc[page_num], page_num, table_detection, ocr_min_chars, table_format) for page_num in range(start, stop)]
+
+
+def _split_page_ranges(page_count: int, workers: int) -> List[tuple]:
+    """Membagi halaman menjadi rentang berurutan yang kurang lebih sama besar."""
+    size, remainder = divmod(page_count, workers)
+    ranges, start = [], 0
+    for i in range(workers):
+        stop = start + size + (1 if i < remainder else 0)
+        if stop > start:
+            ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def _apply_ocr(file_path: str, pages: List[Dict[str, Any]], options: ExtractionOptions):
+    """Mengganti teks halaman pindaian dengan hasil OCR dan mencatat waktunya per halaman."""
+    page_numbers = [page["page"] - 1 for page in pages if page["needs_ocr"]]
+    if not page_numbers:
+        return
+    cache = OcrPageCache(options.ocr_cache_dir) if options.ocr_cache_dir else None
+    results = ocr_pdf_pages(
+        file_path,
+        page_numbers,
+        language=options.ocr_language,
+        dpi=options.ocr_dpi,
+        workers=options.ocr_workers,
+        cache=cache,
+        file_hash=options.content_hash,
+    )
+    errors = set()
+    for page_num, result in results.items():
+        page = pages[page_num]
+        page["ocr_ms"] = round(result["seconds"] * 1000, 1)
+        if result["text"] is None:
+            page["ocr"] = "failed"
+            errors.add(result["error"])
+            continue
+        page["ocr"] = "cached" if result["cached"] else "done"
+        page["text"] = f"\n--- Teks dari Halaman {page_num + 1} ---\n{result['text']}\n--- Akhir Halaman ---\n"
+    for error in errors:
+        print(f"OCR gagal untuk sebagian halaman '{file_path}': {error}")
+
+
+def extract_pdf_pages(file_path: str, options: Optional[ExtractionOptions] = None) -> List[Dict[str, Any]]:
+    """
+    Mengekstrak setiap halaman PDF, lalu menjalankan OCR hanya untuk halaman pindaian.
+
+    Args:
+        file_path: Path file PDF
+        options: Opsi ekstraksi (jumlah worker, deteksi tabel, OCR)
+
+    Returns:
+        Daftar per halaman sesuai urutan: "page", "text", "needs_ocr", "extract_ms",
+        serta "ocr" ("done", "cached", atau "failed") dan "ocr_ms" untuk halaman yang di-OCR.
+
+    Raises:
+        Exception: Jika file tidak dapat dibuka atau dibaca (misalnya PDF rusak), agar job
+            ekstraksi diulang lalu ditandai gagal alih-alih selesai dengan teks kosong
+    """
+    options = options or ExtractionOptions()
+    ocr_min_chars = options.ocr_min_chars if options.ocr_enabled else 0
+    with fitz.open(file_path) as doc:
+        page_count = doc.page_count
+        workers = max(1, min(options.pdf_page_workers, page_count // MIN_PAGES_PER_WORKER))
+        if workers == 1:
+            pages = [
+                _extract_pdf_page(page, page_num, options.table_detection, ocr_min_chars, options.table_format)
+                for page_num, page in enumerate(doc)
+            ]
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_extract_pdf_page_range, file_path, start, stop, options.table_detection, ocr_min_chars, options.table_format)
+                for start, stop in _split_page_ranges(page_count, workers)
+            ]
+            # Hasil dirakit sesuai urutan rentang halaman, bukan urutan selesai
+            pages = [page for future in futures for page in future.result()]
+
+    try:
+        _apply_ocr(file_path, pages, options)
+    except Exception as e:
+        # Teks asli tetap dipakai; OCR hanya pelengkap
+        print(f"Error menjalankan OCR untuk '{file_path}': {e}")
+    return pages
+
+
+def extract_text_and_tables_from_pdf(
+    file_path: str,
+    workers: int = 1,
+    table_detection: str = "ruled",
+    options: Optional[ExtractionOptions] = None,
+    table_format: Optional[str] = None,
+) -> str:
+    """
+    Mengekstrak teks dan mengubah tabel dari file PDF menjadi format deskriptif
+    yang mudah dipahami oleh AI.
+
+    Args:
+        file_path: Path file PDF
+        workers: Jumlah proses untuk membagi halaman; PDF kecil selalu diproses serial
+        table_detection: "ruled", "always", atau "never" (lihat ExtractionOptions)
+        options: Opsi OCR; None berarti tanpa OCR
+        table_format: "markdown", "csv", atau "sentences"; None berarti mengikuti options
+
+    Returns:
+        Teks gabungan semua halaman sesuai urutan halaman
+    """
+    if options is None:
+        options = ExtractionOptions(ocr_enabled=False)
+    options = replace(options, pdf_page_workers=workers, table_detection=table_detection)
+    if table_format:
+        options = replace(options, table_format=table_format)
+    return "".join(page["text"] for page in extract_pdf_pages(file_path, options))
+
+
+_W_P = qn("w:p")
+_W_TBL = qn("w:tbl")
+_W_SDT = qn("w:sdt")
+_W_SDT_CONTENT = qn("w:sdtContent")
+_W_TR = qn("w:tr")
+_W_TC = qn("w:tc")
+_W_R = qn("w:r")
+_W_HYPERLINK = qn("w:hyperlink")
+_W_T = qn("w:t")
+_W_BR = qn("w:br")
+_W_TYPE = qn("w:type")
+# Elemen run yang menghasilkan teks, sama seperti Run.text python-docx
+_RUN_TEXT = {_W_T: None, qn("w:tab"): "\t", qn("w:ptab"): "\t", _W_BR: "\n", qn("w:cr"): "\n", qn("w:noBreakHyphen"): "-"}
+
+
+def _paragraph_text(p) -> str:
+    """
+    Teks satu paragraf (run dan hyperlink), setara Paragraph.text python-docx tetapi
+    membaca pohon XML langsung tanpa xpath per run, sehingga jauh lebih cepat.
+    """
+    parts = []
+    for child in p.iterchildren(_W_R, _W_HYPERLINK):
+        for run in (child.iterchildren(_W_R) if child.tag == _W_HYPERLINK else (child,)):
+            for item in run.iterchildren(*_RUN_TEXT):
+                if item.tag == _W_T:
+                    parts.append(item.text or "")
+                elif item.tag == _W_BR and item.get(_W_TYPE, "textWrapping") != "textWrapping":
+                    continue # Page/column break tidak menghasilkan teks
+                else:
+                    parts.append(_RUN_TEXT[item.tag])
+    return "".join(parts)
+
+
+def _iter_docx_blocks(parent) -> Iterator[Any]:
+    """Paragraf dan tabel (elemen w:p / w:tbl) sesuai urutan, termasuk yang berada di content control."""
+    for child in parent.iterchildren():
+        if child.tag in (_W_P, _W_TBL):
+            yield child
+        elif child.tag == _W_SDT:
+            for content in child.iterchildren(_W_SDT_CONTENT):
+                yield from _iter_docx_blocks(content)
+
+
+def _docx_table_rows(tbl) -> List[List[str]]:
+    """Teks sel tabel DOCX per baris; sel gabungan horizontal diulang sesuai lebarnya agar kolom tetap sejajar."""
+    rows = []
+    for tr in tbl.iterchildren(_W_TR):
+        cells = []
+        for tc in tr.iterchildren(_W_TC):
+            parts = [_paragraph_text(p) for p in tc.iterchildren(_W_P)]
+            # Tabel di dalam sel diratakan menjadi teks agar isinya tidak hilang
+            parts.extend(" ".join(row) for inner in tc.iterchildren(_W_TBL) for row in _docx_table_rows(inner))
+            cells.extend(["\n".join(part for part in parts if part)] * tc.grid_span)
+        rows.append(cells)
+    return rows
+
+
+def iter_docx_text(file_path: str, table_format: str = "markdown") -> Iterator[str]:
+    """
+    Menghasilkan teks DOCX blok demi blok (paragraf atau tabel) sesuai urutan di dokumen.
+
+    Tabel diserialisasi dengan format_table seperti tabel PDF; tabel satu baris
+    (biasanya tabel tata letak) ditulis sebagai teks biasa.
+    """
+    document = docx.Document(file_path)
+    table_num = 0
+    for block in _iter_docx_blocks(document.element.body):
+        if block.tag == _W_P:
+            yield _paragraph_text(block) + "\n"
+            continue
+        rows = _docx_table_rows(block)
+        if len(rows) < 2:
+            yield "".join(cell + "\n" for row in rows for cell in row if cell)
+            continue
+        table_num += 1
+        yield format_table(rows, table_num, table_format)
+
+
+def extract_text_from_docx(file_path: str, table_format: str = "markdown") -> str:
+    """
+    Extracts text content, including tables, from a DOCX file.
+
+    Raises:
+        Exception: If the file cannot be read, like `iter_docx_text`.
+    """
+    return "".join(iter_docx_text(file_path, table_format))
+
+
+def convert_doc_to_docx(file_path: str, out_dir: str, converter: str = "soffice", timeout: int = 120) -> Optional[str]:
+    """
+    Mengonversi file .doc lama ke .docx dengan LibreOffice headless.
+
+    Returns:
+        Path file .docx di out_dir, atau None jika LibreOffice tidak tersedia atau konversi gagal
+    """
+    command = shutil.which(converter) or shutil.which("libreoffice")
+    if not command:
+        return None
+    # Profil LibreOffice terpisah per konversi agar beberapa worker dapat berjalan bersamaan
+    profile = Path(out_dir, "profile").as_uri()
+    try:
+        subprocess.run(
+            [command, f"-env:UserInstallation={profile}", "--headless", "--convert-to", "docx", "--outdir", out_dir, file_path],
+            check=True, capture_output=True, timeout=timeout,
+        )
+    except (subprocess.SubprocessError, OSError) as e:
+        print(f"Konversi .doc gagal untuk '{file_path}': {e}")
+        return None
+    converted = Path(out_dir, Path(file_path).stem + ".docx")
+    return str(converted) if converted.exists() else None
+
+
+def iter_doc_text(file_path: str, options: Optional[ExtractionOptions] = None) -> Iterator[str]:
+    """
+    Menghasilkan teks file .doc (Word 97-2003).
+
+    File .doc yang sebenarnya berformat DOCX dibaca langsung. Selain itu file
+    dikonversi dengan LibreOffice lalu dibaca seperti DOCX (termasuk tabel);
+    jika LibreOffice tidak ada, antiword dipakai untuk teks biasa.
+    """
+    options = options or ExtractionOptions()
+    if zipfile.is_zipfile(file_path):
+        yield from iter_docx_text(file_path, options.table_format)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        converted = convert_doc_to_docx(file_path, tmp, options.doc_converter, options.doc_convert_timeout)
+        if converted:
+            yield from iter_docx_text(converted, options.table_format)
+            return
+
+    antiword = shutil.which("antiword")
+    if antiword:
+        result = subprocess.run([antiword, "-w", "0", file_path], capture_output=True, timeout=options.doc_convert_timeout)
+        if result.returncode == 0:
+            yield result.stdout.decode("utf-8", "replace")
+            return
+    raise RuntimeError(f"Tidak ada konverter .doc (LibreOffice atau antiword) yang dapat membaca '{file_path}'")
+
+
+def iter_text_from_file(file_path: str, options: Optional[ExtractionOptions] = None) -> Iterator[str]:
+    """
+    Menghasilkan teks dokumen sepotong demi sepotong sesuai format file.
+    Mendukung PDF (per halaman), DOCX dan DOC (per paragraf/tabel), dan TXT.
+    """
+    options = options or ExtractionOptions()
+    file_extension = Path(file_path).suffix.lower().lstrip('.')
+
+    if file_extension == "pdf":
+        for page in extract_pdf_pages(file_path, options):
+            yield page["text"]
+    elif file_extension == "docx":
+        yield from iter_docx_text(file_path, options.table_format)
+    elif file_extension == "doc":
+        yield from iter_doc_text(file_path, options)
+    elif file_extension == "txt":
+        with open(file_path, "r", encoding="utf-8") as f:
+            yield from iter(lambda: f.read(1024 * 1024), "")
+    else:
+        raise ValueError(f"Unsupported file type for extraction: {file_extension}")
+
+
+def extract_text_from_file(file_path: str, options: Optional[ExtractionOptions] = None) -> str:
+    """
+    Extracts text content based on file extension.
+    Supports PDF, DOCX, DOC, and TXT files.
+
+    Raises:
+        Exception: If the file cannot be read, so the extraction job is retried and then marked failed.
+    """
+    return "".join(iter_text_from_file(file_path, options))
+
+
+def extract_document(file_path: str, options: Optional[ExtractionOptions] = None) -> Dict[str, Any]:
+    """
+    Fungsi kerja untuk antrean ekstraksi: mengekstrak teks lalu memecahnya menjadi chunk.
+    Dijalankan di proses worker, sehingga hasilnya harus dapat di-pickle.
+
+    Returns:
+        Dict berisi "text" (teks lengkap), "chunks" (daftar Chunk), "pages"
+        (statistik waktu per halaman untuk PDF, tanpa teksnya; kosong untuk format lain),
+        dan "seconds" (total waktu ekstraksi dan chunking)
+    """
+    started = time.perf_counter()
+    options = options or ExtractionOptions()
+    pages = []
+    if Path(file_path).suffix.lower() == ".pdf":
+        pages = extract_pdf_pages(file_path, options)
+        text = "".join(page.pop("text") for page in pages)
+    else:
+        text = extract_text_from_file(file_path, options)
+    chunks = chunk_document(text, max_tokens=options.chunk_max_tokens)
+    return {"text": text, "chunks": chunks, "pages": pages, "seconds": time.perf_counter() - started}
@@ -0,0 +1,177 @@
+"""
+Subsistem health check: prober latar belakang dan circuit breaker.
+
+Pemeriksaan dependensi (Groq, MySQL) dijalankan berkala oleh HealthProber dan
+hasilnya disimpan di memori beserta waktu pemeriksaan, sehingga endpoint
+/health cukup membaca state terakhir tanpa memanggil dependensi apa pun.
+"""
+import asyncio
+import threading
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker sederhana untuk dependensi eksternal.
+
+    Setelah failure_threshold kegagalan berturut-turut, breaker terbuka (open)
+    dan permintaan ditolak tanpa menghubungi dependensi. Setelah reset_timeout
+    detik, tepat satu permintaan percobaan diizinkan (half_open) dan permintaan
+    lain tetap ditolak sampai hasilnya dicatat; jika berhasil, breaker kembali
+    tertutup (closed), jika gagal breaker terbuka lagi.
+
+    Args:
+        failure_threshold: Jumlah kegagalan berturut-turut sebelum breaker terbuka
+        reset_timeout: Lama breaker terbuka (detik) sebelum percobaan ulang
+        trial_timeout: Detik sebelum percobaan yang hasilnya tidak pernah dicatat
+            (misalnya dibatalkan) dianggap hilang, sehingga percobaan baru diizinkan
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0, trial_timeout: float = 120.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.trial_timeout = trial_timeout
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_started: Optional[float] = None # Waktu percobaan half_open yang sedang berjalan
+        self._last_failure: Optional[str] = None
+        self._changed_at = datetime.now()
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._set_state(HALF_OPEN)
+        return self._state
+
+    def _set_state(self, state: str):
+        if state != self._state:
+            self._state = state
+            self._trial_started = None
+            self._changed_at = datetime.now()
+            print(f"Circuit breaker berubah menjadi {state}")
+
+    def allow_request(self) -> bool:
+        """
+        True jika permintaan boleh diteruskan ke dependensi. Saat half_open hanya satu
+        permintaan percobaan yang diizinkan; pemanggil yang mendapat True wajib mencatat
+        hasilnya dengan record_success, record_failure, atau release.
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == OPEN:
+                return False
+            now = time.monotonic()
+            if self._trial_started is not None and now - self._trial_started < self.trial_timeout:
+                return False
+            self._trial_started = now
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._set_state(CLOSED)
+
+    def release(self):
+        """Mencatat permintaan yang selesai tanpa menunjukkan sehat atau tidaknya dependensi (misalnya error 4xx)."""
+        with self._lock:
+            self._trial_started = None
+
+    def record_failure(self, error: Optional[str] = None):
+        with self._lock:
+            self._failures += 1
+            self._last_failure = error
+            if self._current_state() == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._set_state(OPEN)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "consecutive_failures": self._failures,
+                "last_failure": self._last_failure,
+                "changed_at": self._changed_at.isoformat(),
+            }
+
+
+# Fungsi pemeriksaan: coroutine tanpa argumen yang mengembalikan (berhasil, keterangan)
+Check = Callable[[], Awaitable[Tuple[bool, str]]]
+
+
+class HealthProber:
+    """
+    Menjalankan pemeriksaan dependensi secara berkala dan menyimpan hasil terakhirnya.
+
+    Args:
+        checks: Nama dependensi -> fungsi pemeriksaan
+        interval: Jeda antar putaran pemeriksaan (detik)
+        timeout: Batas waktu satu pemeriksaan (detik)
+    """
+
+    def __init__(self, checks: Dict[str, Check], interval: float = 30.0, timeout: float = 5.0):
+        self.checks = checks
+        self.interval = interval
+        self.timeout = timeout
+        self._results: Dict[str, Dict[str, Any]] = {
+            name: {"status": "unknown", "detail": "Belum diperiksa", "checked_at": None, "latency_ms": None}
+            for name in checks
+        }
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Memulai pemeriksaan berkala di latar belakang; putaran pertama langsung dijalankan."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def run_once(self):
+        """Menjalankan semua pemeriksaan secara bersamaan."""
+        await asyncio.gather(*(self._probe(name, check) for name, check in self.checks.items()))
+
+    async def _probe(self, name: str, check: Check):
+        started = time.perf_counter()
+        try:
+            ok, detail = await asyncio.wait_for(check(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            ok, detail = False, f"Pemeriksaan melebihi batas waktu {self.timeout} detik"
+        except Exception as e:
+            ok, detail = False, str(e)
+        self._results[name] = {
+            "status": "up" if ok else "down",
+            "detail": detail,
+            "checked_at": datetime.now().isoformat(),
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"Error pada health prober: {e}")
+            await asyncio.sleep(self.interval)
+
+    def result(self, name: str) -> Dict[str, Any]:
+        return self._results[name]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {name: dict(result) for name, result in self._results.items()}
@@ -0,0 +1,149 @@
+"""
+Antrean job latar belakang berbasis process pool.
+
+Pekerjaan berat CPU (misalnya ekstraksi PDF) dijalankan di ProcessPoolExecutor
+agar event loop FastAPI tidak terblokir. Status job disimpan oleh pemanggil
+melalui callback (misalnya ke database), sehingga modul ini tidak bergantung
+pada model ORM di app.py.
+"""
+import asyncio
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, Tuple
+
+
+class JobQueue:
+    """
+    Antrean job asinkron dengan konkurensi terbatas dan percobaan ulang.
+
+    Args:
+        work_fn: Fungsi level-modul yang dijalankan di proses worker (harus dapat di-pickle)
+        on_start: Callback sinkron (job_id, attempt) saat job mulai dikerjakan
+        on_success: Callback sinkron (job_id, hasil) saat job berhasil; exception darinya diperlakukan seperti job gagal
+        on_failure: Callback sinkron (job_id, pesan_error, akan_diulang) saat job gagal
+        max_workers: Jumlah proses worker sekaligus jumlah job yang berjalan bersamaan
+        max_attempts: Jumlah percobaan maksimum per job sebelum dinyatakan gagal
+        retry_backoff: Jeda dasar (detik) sebelum percobaan ulang, dikalikan nomor percobaan
+    """
+
+    def __init__(
+        self,
+        work_fn: Callable[..., Any],
+        on_start: Optional[Callable[[str, int], None]] = None,
+        on_success: Optional[Callable[[str, Any], None]] = None,
+        on_failure: Optional[Callable[[str, str, bool], None]] = None,
+        max_workers: int = 2,
+        max_attempts: int = 3,
+        retry_backoff: float = 2.0,
+    ):
+        self.work_fn = work_fn
+        self.on_start = on_start
+        self.on_success = on_success
+        self.on_failure = on_failure
+        self.max_workers = max(1, max_workers)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_backoff = retry_backoff
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._consumers = []
+        self._retry_tasks = set()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._consumers)
+
+    def pending_count(self) -> int:
+        """Jumlah job yang menunggu di antrean (belum diambil worker)."""
+        return self._queue.qsize() if self._queue else 0
+
+    async def start(self):
+        """Menyiapkan process pool dan task konsumen. Dipanggil dari event startup."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._loop = asyncio.get_running_loop()
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        self._consumers = [asyncio.create_task(self._consume()) for _ in range(self.max_workers)]
+
+    async def stop(self):
+        """Menghentikan konsumen dan process pool. Job yang belum selesai tetap tercatat di database."""
+        for task in list(self._consumers) + list(self._retry_tasks):
+            task.cancel()
+        await asyncio.gather(*self._consumers, *self._retry_tasks, return_exceptions=True)
+        self._consumers = []
+        self._retry_tasks.clear()
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def submit(self, job_id: str, *args, attempt: int = 1):
+        """
+        Memasukkan job ke antrean tanpa menunggu hasilnya.
+        Aman dipanggil dari thread lain (misalnya endpoint yang berjalan di thread pool).
+
+        Args:
+            job_id: ID job (dipakai untuk callback)
+            *args: Argumen untuk work_fn
+            attempt: Nomor percobaan (untuk job yang dilanjutkan setelah restart)
+        """
+        if self._queue is None:
+            raise RuntimeError("JobQueue belum dijalankan. Panggil start() terlebih dahulu.")
+        try:
+            in_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            in_loop = False
+        if in_loop:
+            self._queue.put_nowait((job_id, args, attempt))
+        else:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, (job_id, args, attempt))
+
+    async def _run_callback(self, callback, *args):
+        if callback is None:
+            return
+        try:
+            # Callback menyentuh database (I/O sinkron), jalankan di thread pool
+            await asyncio.to_thread(callback, *args)
+        except Exception as e:
+            print(f"Error pada callback job: {e}")
+
+    async def _consume(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job_id, args, attempt = await self._queue.get()
+            try:
+                await self._run_callback(self.on_start, job_id, attempt)
+                executor = self._executor
+                try:
+                    result = await loop.run_in_executor(executor, self.work_fn, *args)
+                except BrokenProcessPool:
+                    # Worker mati (misalnya kehabisan memori); buat ulang pool untuk job berikutnya
+                    if self._executor is executor:
+                        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                        executor.shutdown(wait=False)
+                    raise
+                if self.on_success is not None:
+                    # Hasil yang gagal disimpan dihitung sebagai percobaan gagal agar diulang
+                    await asyncio.to_thread(self.on_success, job_id, result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = "".join(traceback.format_exception_only(type(e), e)).strip()
+                will_retry = attempt < self.max_attempts
+                print(f"Job {job_id} gagal (percobaan {attempt}/{self.max_attempts}): {error}")
+                await self._run_callback(self.on_failure, job_id, error, will_retry)
+                if will_retry:
+                    self._schedule_retry(job_id, args, attempt + 1)
+            finally:
+                self._queue.task_done()
+
+    def _schedule_retry(self, job_id: str, args: Tuple, attempt: int):
+        async def retry_later():
+            await asyncio.sleep(self.retry_backoff * (attempt - 1))
+            self._queue.put_nowait((job_id, args, attempt))
+
+        task = asyncio.create_task(retry_later())
+        self._retry_tasks.add(task)
+        task.add_done_callback(self._retry_tasks.discard)
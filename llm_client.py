@@ -0,0 +1,187 @@
+"""
+Klien asinkron untuk API chat completions Groq (kompatibel OpenAI).
+
+Satu httpx.AsyncClient dipakai bersama oleh semua request sehingga koneksi
+TCP/TLS ke Groq digunakan ulang (keep-alive), dan satu worker dapat menahan
+banyak panggilan LLM bersamaan tanpa memakai thread.
+"""
+import json
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+import httpx
+
+
+class GroqAPIError(Exception):
+    """Error HTTP dari API Groq, membawa status code dan header Retry-After (jika ada)."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class GroqClient:
+    """
+    Klien chat completions dengan connection pool.
+
+    Args:
+        api_key: Kunci API Groq
+        api_url: URL endpoint chat completions (dapat diarahkan ke server stub lokal)
+        max_connections: Jumlah maksimum koneksi bersamaan ke API
+        max_keepalive_connections: Jumlah koneksi idle yang dipertahankan
+        timeout: Timeout default per request (detik)
+        connect_timeout: Timeout membuka koneksi (detik)
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        api_url: str,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        timeout: float = 30.0,
+        connect_timeout: float = 5.0,
+    ):
+        self.api_key = api_key
+        self.api_url = api_url
+        # Endpoint daftar model (GET, tanpa memakai kuota token) untuk health check
+        self.models_url = api_url.rsplit("/chat/completions", 1)[0] + "/models"
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Dibuat saat pertama dipakai agar terikat ke event loop yang sedang berjalan
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+        return self._client
+
+    async def close(self):
+        """Menutup semua koneksi dalam pool. Dipanggil saat aplikasi berhenti."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+
+    def _payload(self, messages, model, max_tokens, temperature, top_p, stream) -> Dict[str, Any]:
+        return {
+            "model": model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "top_p": top_p,
+            "stream": stream,
+        }
+
+    @staticmethod
+    def _status_error(response: httpx.Response, body: str) -> GroqAPIError:
+        return GroqAPIError(
+            f"GROQ API mengembalikan status {response.status_code}: {body[:500]}",
+            status_code=response.status_code,
+            retry_after=_parse_retry_after(response.headers.get("retry-after")),
+        )
+
+    async def list_models(self, timeout: Optional[float] = None) -> List[str]:
+        """
+        Mengambil daftar ID model yang tersedia. Jauh lebih murah daripada
+        completion sehingga cocok untuk memeriksa koneksi dan kunci API.
+
+        Raises:
+            GroqAPIError: Jika API mengembalikan status 4xx/5xx
+            httpx.TimeoutException, httpx.TransportError: Jika koneksi gagal atau habis waktu
+        """
+        response = await self._get_client().get(
+            self.models_url,
+            headers=self._headers(),
+            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+        )
+        if response.status_code >= 400:
+            raise self._status_error(response, response.text)
+        return [model["id"] for model in response.json().get("data", [])]
+
+    async def chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        max_tokens: int = 2000,
+        temperature: float = 0.7,
+        top_p: float = 0.9,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Mengirim permintaan chat completion dan mengembalikan body JSON.
+
+        Raises:
+            GroqAPIError: Jika API mengembalikan status 4xx/5xx
+            httpx.TimeoutException, httpx.TransportError: Jika koneksi gagal atau habis waktu
+        """
+        response = await self._get_client().post(
+            self.api_url,
+            json=self._payload(messages, model, max_tokens, temperature, top_p, stream=False),
+            headers=self._headers(),
+            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+        )
+        if response.status_code >= 400:
+            raise self._status_error(response, response.text)
+        return response.json()
+
+    async def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        max_tokens: int = 2000,
+        temperature: float = 0.7,
+        top_p: float = 0.9,
+        timeout: Optional[float] = None,
+        on_usage: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Mengirim permintaan chat completion dengan "stream": true dan menghasilkan
+        potongan teks (delta) segera setelah diterima dari server-sent events Groq.
+        Jika on_usage diberikan, callback itu menerima penggunaan token ("prompt_tokens",
+        "completion_tokens") yang dikirim Groq di event terakhir (x_groq.usage).
+
+        Raises:
+            GroqAPIError: Jika API mengembalikan status 4xx/5xx
+            httpx.TimeoutException, httpx.TransportError: Jika koneksi gagal atau habis waktu
+        """
+        async with self._get_client().stream(
+            "POST",
+            self.api_url,
+            json=self._payload(messages, model, max_tokens, temperature, top_p, stream=True),
+            headers=self._headers(),
+            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+        ) as response:
+            if response.status_code >= 400:
+                body = (await response.aread()).decode("utf-8", errors="replace")
+                raise self._status_error(response, body)
+
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                chunk = json.loads(data)
+                usage = chunk.get("usage") or (chunk.get("x_groq") or {}).get("usage")
+                if usage and on_usage is not None:
+                    on_usage(usage)
+                choices = chunk.get("choices") or []
+                delta = choices[0].get("delta", {}).get("content") if choices else None
+                if delta:
+                    yield delta
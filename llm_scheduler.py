@@ -0,0 +1,236 @@
+"""
+Penjadwal panggilan LLM: pembatas laju token bucket, antrean prioritas, dan retry.
+
+Groq membatasi permintaan per menit (RPM) dan token per menit (TPM) per model.
+Daripada mengirim semua permintaan sekaligus lalu menerima 429, setiap
+panggilan lebih dulu mengantre dan baru dikirim bila kedua bucket memiliki
+kuota. Permintaan interaktif (chat) selalu didahulukan dari pekerjaan latar
+belakang (misalnya ringkasan percakapan). Kegagalan sementara (429, 5xx,
+timeout) diulang dengan jeda backoff eksponensial ber-jitter; header
+Retry-After dari 429 dihormati dan menahan seluruh antrean model itu. Batas
+berlaku per proses worker.
+"""
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+INTERACTIVE = 0
+BACKGROUND = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+
+class SchedulerError(Exception):
+    """Permintaan tidak dapat dijadwalkan (antrean penuh atau terlalu lama menunggu)."""
+
+    def __init__(self, message: str, reason: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+class TokenBucket:
+    """
+    Token bucket: kapasitas penuh per menit, terisi kembali secara merata.
+
+    Args:
+        per_minute: Kuota per menit; 0 berarti tanpa batas
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self._clock = clock
+        self._level = self.capacity
+        self._updated = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Detik sampai `amount` tersedia (amount dibatasi kapasitas agar permintaan besar tetap bisa lewat)."""
+        if self.capacity <= 0:
+            return 0.0
+        self._refill()
+        missing = min(amount, self.capacity) - self._level
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float):
+        if self.capacity > 0:
+            self._refill()
+            self._level -= min(amount, self.capacity)
+
+    def give_back(self, amount: float):
+        """Mengembalikan kuota yang dicadangkan tetapi tidak terpakai."""
+        if self.capacity > 0 and amount > 0:
+            self._refill()
+            self._level = min(self.capacity, self._level + amount)
+
+
+class LLMScheduler:
+    """
+    Antrean prioritas berbatas di depan satu model LLM.
+
+    Args:
+        requests_per_minute, tokens_per_minute: Batas laju; 0 berarti tanpa batas
+        max_queue: Jumlah maksimum permintaan yang menunggu; permintaan berikutnya ditolak
+        max_wait: Detik maksimum menunggu giliran sebelum permintaan ditolak
+        max_retries: Jumlah pengulangan untuk kegagalan sementara
+        base_delay, max_delay: Jeda backoff (detik) untuk pengulangan pertama dan batas atasnya
+        is_retryable: Fungsi exception -> bool untuk kegagalan sementara
+        on_wait: Callback (detik menunggu, nama prioritas) setiap kali permintaan mendapat giliran
+        on_retry: Callback (exception) setiap kali permintaan diulang
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        max_queue: int = 100,
+        max_wait: float = 60.0,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        is_retryable: Callable[[Exception], bool] = lambda e: False,
+        on_wait: Optional[Callable[[float, str], None]] = None,
+        on_retry: Optional[Callable[[Exception], None]] = None,
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.is_retryable = is_retryable
+        self.on_wait = on_wait
+        self.on_retry = on_retry
+        self._queue: List[list] = []  # [prioritas, urutan, token, future]
+        self._order = itertools.count()
+        self._paused_until = 0.0  # Retry-After dari 429 menahan semua permintaan model ini
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._changed: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    def depth(self) -> Dict[str, int]:
+        """Jumlah permintaan yang menunggu per prioritas."""
+        counts = {name: 0 for name in PRIORITY_NAMES.values()}
+        for priority, _, _, future in self._queue:
+            if not future.done():
+                counts[PRIORITY_NAMES[priority]] += 1
+        return counts
+
+    def release_tokens(self, amount: float):
+        """Mengembalikan token yang dicadangkan tetapi tidak terpakai (menurut usage dari API) ke kuota TPM."""
+        self.tokens.give_back(amount)
+
+    def backoff(self, attempt: int, error: Exception) -> float:
+        """Jeda sebelum pengulangan ke-`attempt` (mulai 1): Retry-After bila ada, jika tidak full jitter."""
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after:
+            return min(float(retry_after), self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def _wake(self):
+        # Dibuat saat pertama dipakai agar terikat ke event loop yang sedang berjalan
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._changed, self._dispatcher = loop, asyncio.Event(), None
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+        self._changed.set()
+
+    async def _dispatch(self):
+        """Memberi giliran ke permintaan terdepan begitu kuota RPM dan TPM cukup."""
+        while self._queue:
+            priority, order, tokens, future = self._queue[0]
+            if future.done():  # Dibatalkan atau habis waktu saat menunggu
+                heapq.heappop(self._queue)
+                continue
+            delay = max(self._paused_until - time.monotonic(), self.requests.wait_time(1), self.tokens.wait_time(tokens))
+            if delay > 0:
+                # Permintaan baru berprioritas lebih tinggi dapat menyela penantian ini
+                self._changed.clear()
+                try:
+                    await asyncio.wait_for(self._changed.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            heapq.heappop(self._queue)
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            future.set_result(None)
+
+    async def _acquire(self, tokens: int, priority: int, order: int):
+        if sum(self.depth().values()) >= self.max_queue:
+            raise SchedulerError("Antrean permintaan AI penuh.", "queue_full")
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, [priority, order, tokens, future])
+        self._wake()
+        started = time.monotonic()
+        try:
+            # max_wait membatasi setiap penantian giliran, bukan durasi panggilan dan jeda retry sebelumnya
+            await asyncio.wait_for(future, self.max_wait)
+        except asyncio.TimeoutError:
+            raise SchedulerError("Terlalu lama menunggu giliran permintaan AI.", "queue_timeout") from None
+        finally:
+            if not future.done():
+                future.cancel()
+        if self.on_wait:
+            self.on_wait(time.monotonic() - started, PRIORITY_NAMES[priority])
+
+    async def _retry_or_raise(self, attempt: int, error: Exception, max_retries: Optional[int]):
+        if attempt > (self.max_retries if max_retries is None else max_retries) or not self.is_retryable(error):
+            raise error
+        delay = self.backoff(attempt, error)
+        if getattr(error, "retry_after", None):
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        if self.on_retry:
+            self.on_retry(error)
+        await asyncio.sleep(delay)
+
+    async def run(self, call: Callable[[], Awaitable[Any]], tokens: int, priority: int = INTERACTIVE,
+                  max_retries: Optional[int] = None) -> Any:
+        """
+        Menjalankan call() saat gilirannya tiba, mengulangi kegagalan sementara.
+
+        Args:
+            tokens: Perkiraan token permintaan (prompt + max_tokens) yang dicadangkan dari TPM
+            max_retries: Mengganti max_retries untuk panggilan ini (misalnya 0 bila masih ada model cadangan)
+
+        Raises:
+            SchedulerError: Jika antrean penuh atau satu penantian giliran melebihi max_wait detik
+        """
+        order = next(self._order)  # Pengulangan tetap memakai urutan asli di antrean
+        attempt = 0
+        while True:
+            await self._acquire(tokens, priority, order)
+            try:
+                return await call()
+            except Exception as e:
+                self.tokens.give_back(tokens)  # Percobaan yang gagal tidak memakai kuota token
+                attempt += 1
+                await self._retry_or_raise(attempt, e, max_retries)
+
+    async def stream(self, open_stream: Callable[[], AsyncIterator[Any]], tokens: int,
+                     priority: int = INTERACTIVE, max_retries: Optional[int] = None) -> AsyncIterator[Any]:
+        """Seperti run() untuk streaming; pengulangan hanya terjadi sebelum potongan pertama diterima."""
+        order = next(self._order)
+        attempt = 0
+        while True:
+            await self._acquire(tokens, priority, order)
+            started = False
+            try:
+                async for item in open_stream():
+                    started = True
+                    yield item
+                return
+            except Exception as e:
+                if started:
+                    raise
+                self.tokens.give_back(tokens)
+                attempt += 1
+                await self._retry_or_raise(attempt, e, max_retries)
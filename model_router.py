@@ -0,0 +1,150 @@
+"""
+Pemilihan model AI per permintaan (model router).
+
+Pertanyaan pendek dan pertanyaan umum tanpa dokumen dijawab oleh model kecil
+yang cepat, sedangkan prompt panjang dan analisis beberapa dokumen memakai
+model besar. Setiap rute berisi urutan percobaan: model utama lalu model
+cadangan. Model yang gagal karena 429, 5xx, atau timeout diistirahatkan
+sebentar (cooldown) sehingga permintaan berikutnya langsung memakai model lain.
+Latensi per token jawaban setiap model dicatat sebagai rata-rata bergerak
+eksponensial (EWMA); bila model kecil ternyata lebih lambat daripada model
+besar, permintaan pendek pun dialihkan ke model besar; sebagian kecil tetap
+dikirim ke model kecil agar pemulihan latensinya terlihat.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from prompt_budget import ModelSpec
+
+
+@dataclass
+class Route:
+    """Model yang dicoba berurutan untuk satu permintaan, beserta alasan pemilihan model utama."""
+    models: List[str]
+    reason: str
+
+
+class ModelRouter:
+    """
+    Args:
+        large_models: Model besar sesuai urutan preferensi (CHAT_MODELS)
+        fast_model: Model kecil untuk permintaan pendek; None menonaktifkan routing
+        short_prompt_tokens: Prompt paling banyak sekian token (dengan paling banyak satu dokumen) dianggap pendek
+        cooldown: Detik model diistirahatkan setelah gagal (atau selama Retry-After bila lebih lama)
+        latency_alpha: Bobot sampel terbaru pada EWMA latensi
+        min_samples: Sampel minimum per model sebelum latensinya dipakai untuk routing
+        slower_ratio: Model kecil dianggap lebih lambat bila latensinya melebihi sekian kali model besar
+        probe_every: Saat model kecil dianggap lebih lambat, satu dari sekian permintaan pendek tetap ke model kecil
+        safety_margin: Porsi jendela konteks yang disisakan untuk galat perkiraan token
+    """
+
+    def __init__(
+        self,
+        large_models: Sequence[ModelSpec],
+        fast_model: Optional[ModelSpec] = None,
+        short_prompt_tokens: int = 2000,
+        cooldown: float = 30.0,
+        latency_alpha: float = 0.2,
+        min_samples: int = 5,
+        slower_ratio: float = 1.25,
+        probe_every: int = 10,
+        safety_margin: float = 0.05,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.large_models = list(large_models)
+        self.fast_model = fast_model
+        self.short_prompt_tokens = short_prompt_tokens
+        self.cooldown = cooldown
+        self.latency_alpha = latency_alpha
+        self.min_samples = min_samples
+        self.slower_ratio = slower_ratio
+        self.probe_every = max(1, probe_every)
+        self.safety_margin = safety_margin
+        self._clock = clock
+        self._seconds_per_token: Dict[str, float] = {}
+        self._samples: Dict[str, int] = {}
+        self._detours = 0  # Permintaan pendek yang dialihkan ke model besar karena latensi
+        self._cooling_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _fits(self, spec: ModelSpec, tokens: int) -> bool:
+        return tokens <= spec.context_window * (1 - self.safety_margin)
+
+    def _cooling(self, model: str) -> bool:
+        return self._cooling_until.get(model, 0.0) > self._clock()
+
+    def _latency(self, model: str) -> Optional[float]:
+        if self._samples.get(model, 0) < self.min_samples:
+            return None
+        return self._seconds_per_token[model]
+
+    def _fast_is_slower(self) -> bool:
+        fast = self._latency(self.fast_model.name)
+        large = [latency for latency in map(self._latency, (spec.name for spec in self.large_models)) if latency is not None]
+        if fast is None or not large or fast <= min(large) * self.slower_ratio:
+            return False
+        self._detours += 1
+        return self._detours % self.probe_every != 0
+
+    def route(self, prompt_tokens: int, max_tokens: int, document_count: int) -> Route:
+        """
+        Memilih urutan model untuk sebuah prompt.
+
+        Args:
+            prompt_tokens: Perkiraan token prompt
+            max_tokens: Token yang dicadangkan untuk jawaban
+            document_count: Jumlah dokumen yang potongannya masuk ke prompt
+        """
+        required = prompt_tokens + max_tokens
+        large = [spec.name for spec in self.large_models if self._fits(spec, required)]
+        if not large:
+            large = [max(self.large_models, key=lambda spec: spec.context_window).name]
+        fast = self.fast_model.name if self.fast_model and self._fits(self.fast_model, required) else None
+
+        with self._lock:
+            if fast is None:
+                models, reason = large, "large_only"
+            elif document_count >= 2:
+                models, reason = large + [fast], "multi_document"
+            elif prompt_tokens > self.short_prompt_tokens:
+                models, reason = large + [fast], "long_prompt"
+            elif self._fast_is_slower():
+                models, reason = large + [fast], "fast_slower"
+            else:
+                models, reason = [fast] + large, "general" if document_count == 0 else "short"
+
+            # Model yang sedang diistirahatkan tetap dicoba, tetapi paling akhir
+            models = list(dict.fromkeys(models))
+            ordered = sorted(models, key=self._cooling)
+            if ordered[0] != models[0]:
+                reason = "cooldown"
+        return Route(models=ordered, reason=reason)
+
+    def record_success(self, model: str, seconds: float, completion_tokens: int):
+        """Mencatat latensi panggilan yang berhasil ke EWMA detik per token jawaban model itu."""
+        sample = seconds / max(1, completion_tokens)
+        with self._lock:
+            previous = self._seconds_per_token.get(model)
+            self._seconds_per_token[model] = sample if previous is None else previous + self.latency_alpha * (sample - previous)
+            self._samples[model] = self._samples.get(model, 0) + 1
+            self._cooling_until.pop(model, None)
+
+    def record_failure(self, model: str, retry_after: Optional[float] = None):
+        """Mengistirahatkan model setelah kegagalan sementara."""
+        with self._lock:
+            self._cooling_until[model] = self._clock() + max(self.cooldown, retry_after or 0.0)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Latensi (ms per token jawaban) dan sisa cooldown (detik) setiap model yang pernah dipakai."""
+        with self._lock:
+            now = self._clock()
+            names = list(dict.fromkeys([spec.name for spec in self.large_models] + ([self.fast_model.name] if self.fast_model else [])))
+            return {
+                name: {
+                    "ms_per_token": round(self._seconds_per_token[name] * 1000, 2) if name in self._seconds_per_token else None,
+                    "cooldown_seconds": round(max(0.0, self._cooling_until.get(name, 0.0) - now), 1),
+                }
+                for name in names
+            }
@@ -0,0 +1,146 @@
+"""
+OCR untuk halaman PDF hasil pindaian, dengan cache per halaman.
+
+Halaman yang hampir tidak memiliki lapisan teks tetapi memuat gambar dianggap
+hasil pindaian dan dikenali dengan Tesseract melalui integrasi OCR PyMuPDF
+(Tesseract harus terpasang; lihat TESSDATA_PREFIX). Hasilnya disimpan di disk
+per (hash file, nomor halaman, bahasa, dpi), sehingga ekstraksi ulang file yang
+sama tidak pernah mengulang OCR.
+"""
+import hashlib
+import os
+import shutil
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+import fitz  # PyMuPDF
+
+
+def page_needs_ocr(page, text: str, min_chars: int) -> bool:
+    """Halaman dianggap pindaian jika teksnya kurang dari min_chars karakter tetapi memuat gambar."""
+    return min_chars > 0 and len(text.strip()) < min_chars and bool(page.get_images())
+
+
+def file_sha256(file_path: str, block_size: int = 1024 * 1024) -> str:
+    """SHA-256 isi file, sama dengan content_hash yang disimpan saat unggah."""
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+class OcrPageCache:
+    """
+    Cache teks OCR per halaman di disk: <directory>/<hash file>/<halaman>-<bahasa>-<dpi>.txt
+
+    Args:
+        directory: Folder cache (dibuat bila belum ada)
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, file_hash: str, page_num: int, language: str, dpi: int) -> str:
+        return os.path.join(self.directory, file_hash, f"{page_num}-{language}-{dpi}.txt")
+
+    def get(self, file_hash: str, page_num: int, language: str, dpi: int) -> Optional[str]:
+        try:
+            with open(self._path(file_hash, page_num, language, dpi), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def set(self, file_hash: str, page_num: int, language: str, dpi: int, text: str):
+        path = self._path(file_hash, page_num, language, dpi)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Ditulis ke nama sementara lalu di-rename agar pembaca tidak melihat file setengah jadi
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def remove(self, file_hash: str):
+        """Menghapus semua halaman tercache milik satu file (misalnya saat file dihapus)."""
+        shutil.rmtree(os.path.join(self.directory, file_hash), ignore_errors=True)
+
+
+def _ocr_page_list(file_path: str, page_numbers: Sequence[int], language: str, dpi: int) -> List[Dict[str, Any]]:
+    """
+    Menjalankan OCR untuk beberapa halaman. Dijalankan di proses worker; setiap worker
+    membuka file sendiri. Jika Tesseract tidak tersedia, halaman sisanya tidak dicoba lagi.
+    """
+    results = []
+    error = None
+    with fitz.open(file_path) as doc:
+        for page_num in page_numbers:
+            started = time.perf_counter()
+            text = None
+            if error is None:
+                try:
+                    page = doc[page_num]
+                    textpage = page.get_textpage_ocr(language=language, dpi=dpi, full=True)
+                    text = page.get_text("text", textpage=textpage)
+                except Exception as e:
+                    error = str(e)
+            results.append({
+                "page_num": page_num,
+                "text": text,
+                "seconds": time.perf_counter() - started,
+                "error": error if text is None else None,
+            })
+    return results
+
+
+def ocr_pdf_pages(
+    file_path: str,
+    page_numbers: Sequence[int],
+    language: str = "ind+eng",
+    dpi: int = 300,
+    workers: int = 1,
+    cache: Optional[OcrPageCache] = None,
+    file_hash: Optional[str] = None,
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Mengenali teks halaman-halaman PDF dengan OCR, memakai cache bila ada.
+
+    Args:
+        file_path: Path file PDF
+        page_numbers: Nomor halaman (mulai 0) yang perlu di-OCR
+        language: Bahasa Tesseract, misalnya "ind+eng"
+        dpi: Resolusi render halaman untuk OCR
+        workers: Jumlah proses OCR; halaman dibagi bergiliran agar beban merata
+        cache: Cache halaman; None berarti tanpa cache
+        file_hash: SHA-256 file bila sudah diketahui (content_hash saat unggah); None berarti dihitung ulang
+
+    Returns:
+        Nomor halaman -> {"text", "seconds", "cached", "error"}; text None jika OCR gagal
+    """
+    results: Dict[int, Dict[str, Any]] = {}
+    if cache and not file_hash:
+        file_hash = file_sha256(file_path)
+    pending = []
+    for page_num in page_numbers:
+        started = time.perf_counter()
+        text = cache.get(file_hash, page_num, language, dpi) if cache else None
+        if text is not None:
+            results[page_num] = {"text": text, "seconds": time.perf_counter() - started, "cached": True, "error": None}
+        else:
+            pending.append(page_num)
+
+    workers = max(1, min(workers, len(pending)))
+    if workers == 1:
+        outcomes = _ocr_page_list(file_path, pending, language, dpi) if pending else []
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_ocr_page_list, file_path, pending[i::workers], language, dpi) for i in range(workers)]
+            outcomes = [outcome for future in futures for outcome in future.result()]
+
+    for outcome in outcomes:
+        page_num = outcome.pop("page_num")
+        if cache and outcome["text"] is not None:
+            cache.set(file_hash, page_num, language, dpi, outcome["text"])
+        results[page_num] = {**outcome, "cached": False}
+    return results
@@ -0,0 +1,184 @@
+"""
+Penyusunan anggaran token untuk prompt chat multi-dokumen.
+
+Bagian tetap prompt (aturan, pertanyaan, judul dokumen) dihitung lebih dulu,
+ruang untuk jawaban (max_tokens) dicadangkan, lalu sisa jendela konteks model
+dibagi ke dokumen sebanding dengan relevansi chunk terbaiknya. Jumlah token
+per chunk sudah dihitung saat unggah, sehingga penyusunan hanya menjumlahkan
+bilangan bulat dan tetap murah meskipun konteksnya besar.
+"""
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+from retrieval import Chunk, estimate_tokens
+
+# Kandidat chunk hasil retrieval.rank_chunks: (document_id, Chunk, skor)
+Candidate = Tuple[str, Chunk, float]
+
+# Hanya sekian kali top_k kandidat teratas yang dipertimbangkan saat membagi anggaran
+CANDIDATE_POOL_FACTOR = 4
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    """Model AI beserta jendela konteksnya (token masukan + keluaran)."""
+    name: str
+    context_window: int
+
+
+@dataclass
+class PromptPlan:
+    """Hasil perencanaan: batas jawaban dan chunk yang masuk ke prompt (model dipilih oleh model_router)."""
+    max_tokens: int
+    context: List[Candidate]
+    prompt_tokens: int
+    allocations: Dict[str, int] = field(default_factory=dict)
+
+
+@lru_cache(maxsize=64)
+def count_static_tokens(text: str) -> int:
+    """estimate_tokens dengan cache, untuk teks yang sama di setiap permintaan (aturan, pesan sistem)."""
+    return estimate_tokens(text)
+
+
+def parse_model_specs(value: str) -> List[ModelSpec]:
+    """
+    Membaca daftar model dari konfigurasi berformat "nama:jendela,nama:jendela".
+
+    Urutan daftar adalah urutan preferensi: model pertama yang muat dipakai.
+    """
+    specs = []
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, window = item.rpartition(":")
+        if not name or not window.isdigit():
+            raise ValueError(f"Format model tidak valid: '{item}' (contoh: llama-3.3-70b-versatile:131072)")
+        specs.append(ModelSpec(name=name, context_window=int(window)))
+    if not specs:
+        raise ValueError("Daftar model kosong.")
+    return specs
+
+
+def choose_model(models: Sequence[ModelSpec], required_tokens: int) -> ModelSpec:
+    """Model pertama yang jendelanya cukup; jika tidak ada, model dengan jendela terbesar."""
+    for spec in models:
+        if spec.context_window >= required_tokens:
+            return spec
+    return max(models, key=lambda spec: spec.context_window)
+
+
+def allocate_budget(candidates: Sequence[Candidate], budget: int, top_k: int, per_chunk_overhead: int = 0) -> Tuple[List[Candidate], Dict[str, int]]:
+    """
+    Membagi anggaran token ke dokumen sebanding dengan relevansinya.
+
+    Relevansi sebuah dokumen adalah jumlah skor chunk-nya di antara top_k
+    kandidat teratas; jika semua skor 0, setiap dokumen mendapat bagian sama.
+    Sisa bagian yang tidak terpakai diberikan ke kandidat berikutnya menurut
+    peringkat global. Hanya top_k * CANDIDATE_POOL_FACTOR kandidat teratas
+    yang dipertimbangkan.
+
+    Args:
+        candidates: Kandidat terurut dari yang paling relevan
+        budget: Total token untuk konteks
+        top_k: Jumlah maksimum chunk yang diambil
+        per_chunk_overhead: Token tambahan per chunk (misalnya label halaman)
+
+    Returns:
+        (chunk terpilih dikelompokkan per dokumen, bagian token per dokumen)
+    """
+    if budget <= 0 or top_k <= 0 or not candidates:
+        return [], {}
+    candidates = candidates[:top_k * CANDIDATE_POOL_FACTOR]
+
+    weights: Dict[str, float] = {}
+    for doc_id, _, score in candidates[:top_k]:
+        weights[doc_id] = weights.get(doc_id, 0.0) + max(score, 0.0)
+    total_weight = sum(weights.values())
+    if total_weight <= 0:
+        weights = {doc_id: 1.0 for doc_id in weights}
+        total_weight = float(len(weights))
+    shares = {doc_id: int(budget * weight / total_weight) for doc_id, weight in weights.items()}
+
+    taken = [False] * len(candidates)
+    used: Dict[str, int] = {}
+    count = 0
+    # Putaran pertama: setiap dokumen mengisi bagiannya sendiri
+    for i, (doc_id, chunk, _) in enumerate(candidates):
+        if count >= top_k:
+            break
+        cost = chunk.token_count + per_chunk_overhead
+        if used.get(doc_id, 0) + cost <= shares.get(doc_id, 0):
+            taken[i] = True
+            used[doc_id] = used.get(doc_id, 0) + cost
+            count += 1
+
+    # Putaran kedua: sisa anggaran untuk kandidat terbaik yang belum terambil
+    leftover = budget - sum(used.values())
+    for i, (doc_id, chunk, _) in enumerate(candidates):
+        if count >= top_k or leftover <= 0:
+            break
+        cost = chunk.token_count + per_chunk_overhead
+        if not taken[i] and cost <= leftover:
+            taken[i] = True
+            used[doc_id] = used.get(doc_id, 0) + cost
+            leftover -= cost
+            count += 1
+
+    # Dokumen paling relevan lebih dulu, chunk sesuai urutan di dokumen
+    doc_rank = {}
+    for doc_id, _, _ in candidates:
+        doc_rank.setdefault(doc_id, len(doc_rank))
+    selected = [candidates[i] for i in range(len(candidates)) if taken[i]]
+    selected.sort(key=lambda c: (doc_rank[c[0]], c[1].chunk_index))
+    return selected, shares
+
+
+def plan_prompt(
+    candidates: Sequence[Candidate],
+    fixed_tokens: int,
+    models: Sequence[ModelSpec],
+    max_tokens: int = 1500,
+    context_cap: int = 3000,
+    top_k: int = 8,
+    per_chunk_overhead: int = 4,
+    safety_margin: float = 0.05,
+) -> PromptPlan:
+    """
+    Merencanakan isi prompt untuk satu permintaan. Anggaran mengikuti jendela model
+    pertama yang muat; model yang benar-benar dipakai dipilih kemudian oleh model_router.
+
+    Args:
+        candidates: Kandidat chunk terurut dari yang paling relevan
+        fixed_tokens: Token bagian tetap prompt (pesan sistem, aturan, pertanyaan, judul dokumen)
+        models: Model yang boleh dipakai, urut sesuai preferensi
+        max_tokens: Token yang dicadangkan untuk jawaban
+        context_cap: Batas atas token konteks dokumen meskipun jendela model lebih besar
+        top_k: Jumlah maksimum chunk
+        per_chunk_overhead: Token tambahan per chunk di dalam prompt
+        safety_margin: Porsi jendela yang disisakan untuk galat perkiraan token
+    """
+    wanted = 0
+    for _, chunk, _ in candidates[:top_k]:
+        wanted += chunk.token_count + per_chunk_overhead
+    wanted = min(wanted, context_cap)
+
+    def usable(spec: ModelSpec) -> int:
+        return int(spec.context_window * (1 - safety_margin))
+
+    spec = choose_model([ModelSpec(m.name, usable(m)) for m in models], fixed_tokens + wanted + max_tokens)
+    window = spec.context_window
+    # Jawaban tetap mendapat ruang walaupun prompt tetap sudah besar
+    max_tokens = max(1, min(max_tokens, window - fixed_tokens))
+    context_budget = max(0, min(context_cap, window - fixed_tokens - max_tokens))
+
+    context, allocations = allocate_budget(candidates, context_budget, top_k, per_chunk_overhead)
+    context_tokens = sum(chunk.token_count + per_chunk_overhead for _, chunk, _ in context)
+    return PromptPlan(
+        max_tokens=max_tokens,
+        context=context,
+        prompt_tokens=fixed_tokens + context_tokens,
+        allocations=allocations,
+    )
@@ -0,0 +1,183 @@
+"""
+Cache jawaban AI untuk pertanyaan yang sering diulang (misalnya pertanyaan umum).
+
+Kunci cache dibentuk dari pertanyaan yang dinormalisasi, ID dokumen beserta
+hash kontennya, model, dan versi prompt. Cache terdiri dari dua tingkat:
+memori proses (LRU + TTL) dan penyimpanan persisten yang disediakan pemanggil
+melalui callback (misalnya tabel database), sehingga modul ini tidak
+bergantung pada model ORM di app.py.
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+_WHITESPACE = re.compile(r"\s+")
+_TRAILING_PUNCTUATION = re.compile(r"[\s?.!]+$")
+
+
+def normalize_question(question: str) -> str:
+    """Menormalkan pertanyaan: huruf kecil, spasi tunggal, tanpa tanda baca di akhir."""
+    return _TRAILING_PUNCTUATION.sub("", _WHITESPACE.sub(" ", question.strip().lower()))
+
+
+def build_cache_key(question: str, documents: Iterable[Tuple[str, Optional[str]]], model: str, prompt_version: str) -> str:
+    """
+    Membentuk kunci cache.
+
+    Args:
+        question: Pertanyaan pengguna (akan dinormalisasi)
+        documents: Pasangan (document_id, content_hash) dokumen konteks
+        model: Nama model AI
+        prompt_version: Versi template prompt; ubah nilainya agar cache lama tidak terpakai
+    """
+    material = json.dumps({
+        "q": normalize_question(question),
+        "docs": sorted([doc_id, content_hash or ""] for doc_id, content_hash in documents),
+        "model": model,
+        "prompt": prompt_version,
+    }, sort_keys=True)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class LRUTTLCache:
+    """Cache memori dengan batas jumlah entri (LRU) dan masa berlaku (TTL). Aman dipakai antar-thread."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._keys_by_document: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, entry = item
+            if expires_at <= time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: Dict[str, Any], expires_at: float):
+        with self._lock:
+            self._entries[key] = (expires_at, entry)
+            self._entries.move_to_end(key)
+            for doc_id in entry.get("document_ids", []):
+                self._keys_by_document.setdefault(doc_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_document(self, document_id: str) -> int:
+        """Menghapus semua entri yang memakai dokumen tertentu. Mengembalikan jumlah entri terhapus."""
+        with self._lock:
+            keys = self._keys_by_document.pop(document_id, set())
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def _remove(self, key: str):
+        item = self._entries.pop(key, None)
+        if item is None:
+            return
+        for doc_id in item[1].get("document_ids", []):
+            keys = self._keys_by_document.get(doc_id)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_document[doc_id]
+
+
+class ResponseCache:
+    """
+    Cache jawaban dua tingkat dengan statistik hit rate dan latensi yang dihemat.
+
+    Args:
+        max_entries: Jumlah maksimum entri di memori
+        ttl_seconds: Masa berlaku entri (detik)
+        load: Callback (key) -> (entry, expires_at_epoch) atau None, untuk tingkat persisten
+        store: Callback (key, entry, expires_at_epoch) untuk tingkat persisten
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: float = 86400,
+        load: Optional[Callable[[str], Optional[Tuple[Dict[str, Any], float]]]] = None,
+        store: Optional[Callable[[str, Dict[str, Any], float], None]] = None,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.memory = LRUTTLCache(max_entries)
+        self._load = load
+        self._store = store
+        self._stats_lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "persistent_hits": 0, "misses": 0, "saved_seconds": 0.0}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Mencari jawaban di memori lalu di penyimpanan persisten.
+
+        Returns:
+            Entry berisi "response", "source_documents", "document_ids", dan "latency"
+            (detik yang dibutuhkan panggilan AI aslinya), atau None jika tidak ada.
+        """
+        start = time.perf_counter()
+        tier = "memory_hits"
+        entry = self.memory.get(key)
+        if entry is None and self._load is not None:
+            try:
+                loaded = self._load(key)
+            except Exception as e:
+                print(f"Gagal membaca cache persisten: {e}")
+                loaded = None
+            if loaded is not None:
+                entry, expires_at = loaded
+                tier = "persistent_hits"
+                self.memory.set(key, entry, expires_at)
+
+        with self._stats_lock:
+            if entry is None:
+                self.stats["misses"] += 1
+            else:
+                self.stats[tier] += 1
+                self.stats["saved_seconds"] += max(0.0, entry.get("latency", 0.0) - (time.perf_counter() - start))
+        return entry
+
+    def set(self, key: str, response: str, source_documents: List[str], document_ids: List[str], latency: float):
+        """Menyimpan jawaban ke kedua tingkat cache."""
+        entry = {
+            "response": response,
+            "source_documents": source_documents,
+            "document_ids": document_ids,
+            "latency": latency,
+        }
+        expires_at = time.time() + self.ttl_seconds
+        self.memory.set(key, entry, expires_at)
+        if self._store is not None:
+            try:
+                self._store(key, entry, expires_at)
+            except Exception as e:
+                print(f"Gagal menyimpan cache persisten: {e}")
+
+    def invalidate_document(self, document_id: str):
+        """Menghapus entri memori untuk dokumen; tingkat persisten dihapus oleh pemanggil dalam transaksinya."""
+        self.memory.invalidate_document(document_id)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Statistik cache untuk endpoint metrik."""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        hits = stats["memory_hits"] + stats["persistent_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        stats["saved_seconds"] = round(stats["saved_seconds"], 3)
+        stats["memory_entries"] = len(self.memory)
+        return stats
@@ -0,0 +1,256 @@
+"""
+Utilitas chunking dan pencarian leksikal (BM25) untuk konteks chat.
+
+Teks hasil ekstraksi dipecah menjadi potongan (chunk) yang mengikuti batas
+halaman dan tabel saat dokumen diunggah. Setiap chunk menyimpan frekuensi
+term-nya sehingga saat chat hanya perlu menghitung skor BM25 atas chunk
+dokumen yang dipilih; pemilihan chunk sesuai anggaran token dilakukan di prompt_budget.py.
+"""
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Perkiraan kasar: 1 token ~ 4 karakter untuk teks campuran Indonesia/Inggris (dipakai untuk ukuran chunk)
+CHARS_PER_TOKEN = 4
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Pemecahan teks ala tokenizer BPE: sub-kata hingga 4 huruf, angka per 3 digit
+# (seperti tokenizer Llama 3), dan setiap tanda baca satu token
+_TOKEN_PIECE = re.compile(r"[^\W\d_]{1,4}|\d{1,3}|[^\w\s]|_", re.UNICODE)
+
+# Kata umum yang tidak membantu membedakan chunk satu dengan lainnya
+STOPWORDS = frozenset("""
+ada adalah akan apa atau bagaimana bahwa bisa dalam dan dapat dari dengan di
+dokumen ini itu juga kapan ke kepada mana mengapa oleh pada para saja sebagai
+secara sedang sehingga siapa sudah tersebut tentang telah tidak untuk yang
+the of and to in is for on are was with
+""".split())
+
+# Penanda yang dihasilkan oleh extract_text_and_tables_from_pdf
+_PAGE_MARKER = re.compile(r"^--- Teks dari Halaman (\d+) ---$")
+_TABLE_PAGE_MARKER = re.compile(r"^--- Tabel Ditemukan di Halaman (\d+) ---$")
+_TABLE_START = re.compile(r"^\[Mulai Data Tabel (\d+)(?: \((markdown|csv)\))?\]$")
+_TABLE_END = re.compile(r"^\[Akhir Data Tabel (\d+)\]$")
+_PAGE_END = "--- Akhir Halaman ---"
+# Jumlah baris header tabel ringkas (header Markdown diikuti baris pemisah "| --- |")
+_TABLE_HEADER_LINES = {"markdown": 2, "csv": 1}
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Memperkirakan jumlah token sebuah teks tanpa tokenizer eksternal.
+
+    Meniru perilaku tokenizer BPE: kata pendek dihitung satu token, kata
+    panjang dipecah per 4 huruf, angka per 3 digit, dan setiap tanda baca
+    satu token. Pencocokan dilakukan seluruhnya oleh regex sehingga cepat.
+    """
+    if not text:
+        return 0
+    return len(_TOKEN_PIECE.findall(text))
+
+
+def tokenize(text: str) -> List[str]:
+    """Memecah teks menjadi term huruf kecil dan membuang stopword."""
+    return [
+        term for term in _TOKEN_PATTERN.findall(text.lower())
+        if len(term) > 1 and term not in STOPWORDS
+    ]
+
+
+@dataclass
+class Chunk:
+    """Potongan teks dokumen beserta statistik term untuk indeks BM25."""
+    chunk_index: int
+    content: str
+    page_number: Optional[int] = None
+    kind: str = "text"  # "text" atau "table"
+    token_count: int = 0
+    term_freqs: Dict[str, int] = field(default_factory=dict)
+
+
+def _split_long_line(line: str, max_chars: int) -> List[str]:
+    """Memecah satu baris yang terlalu panjang pada batas kata."""
+    if len(line) <= max_chars:
+        return [line]
+    pieces, current = [], []
+    length = 0
+    for word in line.split():
+        if current and length + len(word) + 1 > max_chars:
+            pieces.append(" ".join(current))
+            current, length = [], 0
+        current.append(word)
+        length += len(word) + 1
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def _iter_segments(text: str) -> Iterable[Tuple[Optional[int], str, Optional[str], List[str]]]:
+    """
+    Menghasilkan segmen (halaman, jenis, label, baris) dari teks hasil ekstraksi.
+    Teks tanpa penanda halaman (TXT/DOCX) diperlakukan sebagai satu segmen teks.
+    Header tabel Markdown/CSV dimasukkan ke label sehingga diulang di setiap chunk tabel.
+    """
+    page: Optional[int] = None
+    kind, label, lines = "text", None, []
+    header_lines = 0
+
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        page_match = _PAGE_MARKER.match(line) or _TABLE_PAGE_MARKER.match(line)
+        table_start = _TABLE_START.match(line)
+
+        if page_match or table_start or _TABLE_END.match(line) or line == _PAGE_END:
+            if lines:
+                yield page, kind, label, lines
+            lines = []
+            if page_match:
+                page = int(page_match.group(1))
+                kind, label = "text", None
+            elif table_start:
+                kind = "table"
+                label = f"[Data Tabel {table_start.group(1)}" + (f", Halaman {page}]" if page else "]")
+                header_lines = _TABLE_HEADER_LINES.get(table_start.group(2), 0)
+            else:
+                kind, label = "text", None
+            continue
+
+        if line and header_lines:
+            label += "\n" + line
+            header_lines -= 1
+        elif line:
+            lines.append(line)
+
+    if lines:
+        yield page, kind, label, lines
+
+
+def chunk_document(text: str, max_tokens: int = 350) -> List[Chunk]:
+    """
+    Memecah teks dokumen menjadi chunk yang tidak melewati batas halaman/tabel.
+
+    Args:
+        text: Teks hasil ekstraksi (format keluaran extract_text_from_file)
+        max_tokens: Perkiraan ukuran maksimum satu chunk dalam token
+
+    Returns:
+        Daftar Chunk berurutan sesuai posisi di dokumen
+    """
+    if not text or not text.strip():
+        return []
+
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    chunks: List[Chunk] = []
+
+    def flush(page, kind, label, buffer):
+        body = "\n".join(buffer)
+        content = f"{label}\n{body}" if label else body
+        terms = Counter(tokenize(content))
+        chunks.append(Chunk(
+            chunk_index=len(chunks),
+            content=content,
+            page_number=page,
+            kind=kind,
+            token_count=estimate_tokens(content),
+            term_freqs=dict(terms),
+        ))
+
+    for page, kind, label, lines in _iter_segments(text):
+        buffer: List[str] = []
+        length = len(label) + 1 if label else 0
+        for line in lines:
+            for piece in _split_long_line(line, max_chars):
+                if buffer and length + len(piece) + 1 > max_chars:
+                    flush(page, kind, label, buffer)
+                    buffer = []
+                    length = len(label) + 1 if label else 0
+                buffer.append(piece)
+                length += len(piece) + 1
+        if buffer:
+            flush(page, kind, label, buffer)
+
+    return chunks
+
+
+class BM25Index:
+    """
+    Indeks BM25 sederhana atas sekumpulan chunk.
+
+    Statistik per chunk (frekuensi term dan panjang) dihitung saat unggah,
+    sehingga membangun indeks ini saat chat hanya menghitung IDF dan panjang rata-rata.
+    """
+
+    def __init__(self, term_freqs: Sequence[Dict[str, int]], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.term_freqs = list(term_freqs)
+        self.lengths = [sum(tf.values()) for tf in self.term_freqs]
+        count = len(self.term_freqs)
+        self.avg_length = (sum(self.lengths) / count) if count else 0.0
+
+        doc_freqs: Counter = Counter()
+        for tf in self.term_freqs:
+            doc_freqs.update(tf.keys())
+        self.idf = {
+            term: math.log(1 + (count - df + 0.5) / (df + 0.5))
+            for term, df in doc_freqs.items()
+        }
+
+    def scores(self, query: str) -> List[float]:
+        """Menghitung skor BM25 setiap chunk untuk sebuah pertanyaan."""
+        query_terms = set(tokenize(query))
+        results = [0.0] * len(self.term_freqs)
+        if not query_terms or not self.avg_length:
+            return results
+
+        for i, tf in enumerate(self.term_freqs):
+            norm = self.k1 * (1 - self.b + self.b * self.lengths[i] / self.avg_length)
+            score = 0.0
+            for term in query_terms:
+                freq = tf.get(term)
+                if freq:
+                    score += self.idf[term] * freq * (self.k1 + 1) / (freq + norm)
+            results[i] = score
+        return results
+
+
+def _rank_order(query: str, chunks: Sequence[Tuple[str, Chunk]]) -> Tuple[List[int], List[float]]:
+    index = BM25Index([chunk.term_freqs for _, chunk in chunks])
+    scores = index.scores(query)
+
+    if any(score > 0 for score in scores):
+        order = sorted(range(len(chunks)), key=lambda i: scores[i], reverse=True)
+        order = [i for i in order if scores[i] > 0]
+    else:
+        # Round-robin dari awal setiap dokumen agar semua dokumen terwakili
+        positions: Dict[str, List[int]] = {}
+        for i, (doc_id, _) in enumerate(chunks):
+            positions.setdefault(doc_id, []).append(i)
+        queues = list(positions.values())
+        order = []
+        depth = 0
+        while len(order) < len(chunks):
+            for queue in queues:
+                if depth < len(queue):
+                    order.append(queue[depth])
+            depth += 1
+    return order, scores
+
+
+def rank_chunks(query: str, chunks: Sequence[Tuple[str, Chunk]]) -> List[Tuple[str, Chunk, float]]:
+    """
+    Mengurutkan chunk kandidat dari yang paling relevan, tanpa batas token.
+
+    Returns:
+        Daftar (document_id, Chunk, skor) terurut dari skor tertinggi. Jika tidak
+        ada term yang cocok, chunk awal setiap dokumen diurutkan secara bergiliran
+        dengan skor 0.
+    """
+    if not chunks:
+        return []
+    order, scores = _rank_order(query, chunks)
+    return [(chunks[i][0], chunks[i][1], scores[i]) for i in order]
+
@@ -7,6 +7,10 @@ const API_BASE_URL = 'http://10.44.5.104:8000';  // Ubah sesuai server yang seda
 const MAX_FILES_UPLOAD = 5;
 const MAX_FILE_SIZE_MB = 10;
 const MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB * 1024 * 1024;
+const STATUS_POLL_INTERVAL_MS = 2000; // Interval polling status pemrosesan dokumen
+const DOCUMENT_PAGE_SIZE = 50; // Jumlah dokumen per halaman (dimuat saat scroll)
+const HISTORY_PAGE_SIZE = 20; // Jumlah riwayat chat per halaman
+const SEARCH_DEBOUNCE_MS = 300; // Jeda sebelum pencarian dokumen dikirim ke server
 
 let currentUser = { username: "Anonim", role: "public_user", email: "" };
 let currentToken = null; // Currently not used for auth, but kept if future auth is added
@@ -15,7 +19,12 @@ let currentChatSessionMessages = [];
 let selectedUploadFiles = [];
 let confirmCallback = null; // Callback for confirmation modal
 let allChatDocuments = []; // Store all documents for chat search functionality
-let allMainDocuments = []; // Store all documents for main documents section search
+let allMainDocuments = []; // Documents loaded so far in the main documents section
+let documentsPager = null;
+let adminDocumentsPager = null;
+let chatDocumentsPager = null;
+let historyPager = null;
+let mainSearchTimeout = null;
 
 // --- DOM ELEMENTS CACHE ---
 // Centralized access to frequently used DOM elements for better performance and readability.
@@ -259,6 +268,7 @@ function renderEmptyState(containerElement, message) {
 async function apiCall(endpoint, options = {}) {
     const url = `${API_BASE_URL}${endpoint}`;
     const config = {
+        credentials: 'include', // Sends the chat session cookie to the API server
         ...options,
         headers: {
             ...(options.body instanceof FormData ? {} : { 'Content-Type': 'application/json' }),
@@ -292,6 +302,79 @@ async function apiCall(endpoint, options = {}) {
     }
 }
 
+/**
+ * Creates a pager for cursor-paginated list endpoints (`/documents`, `/admin/documents`, `/history`).
+ * The next page is requested when a sentinel element at the end of the container scrolls into view.
+ * @param {Object} options
+ * @param {string} options.endpoint - API endpoint without query parameters.
+ * @param {string} options.itemsKey - Key of the item array in the response (e.g., 'documents').
+ * @param {HTMLElement} options.container - List container; the sentinel is kept as its last child.
+ * @param {Function} options.onPage - Called with (items, isFirstPage) to render each page.
+ * @param {number} [options.pageSize] - Number of items per page.
+ * @returns {{reset: Function}} Call reset(params) to (re)load from the first page with new filters.
+ */
+function createPager({ endpoint, itemsKey, container, onPage, pageSize = DOCUMENT_PAGE_SIZE }) {
+    let params = {};
+    let cursor = null;
+    let done = false;
+    let loading = false;
+    let generation = 0; // Discards responses that arrive after a reset
+    const sentinel = document.createElement('div');
+    sentinel.className = 'list-sentinel';
+    sentinel.setAttribute('aria-hidden', 'true');
+
+    const observer = new IntersectionObserver((entries) => {
+        if (entries.some(entry => entry.isIntersecting)) {
+            loadNext().catch(error => showAlert(`Gagal memuat data berikutnya: ${error.message}`, 'error', 7000));
+        }
+    }, { rootMargin: '200px' });
+
+    function buildEndpoint() {
+        const query = new URLSearchParams({ ...params, limit: pageSize });
+        if (cursor) query.set('cursor', cursor);
+        for (const [key, value] of [...query.entries()]) {
+            if (value === '' || value === 'undefined' || value === 'null') query.delete(key);
+        }
+        return `${endpoint}?${query.toString()}`;
+    }
+
+    async function loadNext() {
+        if (loading || done) return;
+        loading = true;
+        const currentGeneration = generation;
+        try {
+            const data = await apiCall(buildEndpoint());
+            if (currentGeneration !== generation) return;
+            const isFirstPage = cursor === null;
+            cursor = data.next_cursor || null;
+            done = !cursor;
+            onPage(data[itemsKey] || [], isFirstPage);
+        } finally {
+            if (currentGeneration === generation) loading = false;
+        }
+        observer.unobserve(sentinel);
+        if (done) {
+            sentinel.remove();
+        } else {
+            container.appendChild(sentinel); // Keep the sentinel after the newly rendered items
+            observer.observe(sentinel); // Re-observing reports again if the page did not fill the view
+        }
+    }
+
+    return {
+        async reset(newParams = {}) {
+            generation++;
+            params = newParams;
+            cursor = null;
+            done = false;
+            loading = false;
+            observer.unobserve(sentinel);
+            sentinel.remove();
+            await loadNext();
+        }
+    };
+}
+
 // --- NAVIGATION & SECTION MANAGEMENT ---
 
 /**
@@ -490,24 +573,16 @@ async function performUploadDocuments() {
     try {
         const data = await apiCall('/upload', { method: 'POST', body: formData });
         const uploadedCount = data.uploaded_documents ? data.uploaded_documents.length : 0;
-        showAlert(`${uploadedCount} dokumen berhasil diunggah!`, 'success', 5000);
+        showAlert(`${uploadedCount} dokumen berhasil diunggah dan sedang diproses...`, 'success', 5000);
 
         // Clear selected files and update UI
         selectedUploadFiles = [];
         updateSelectedFilesUI();
         if (elements.fileInput) elements.fileInput.value = ''; // Reset file input
 
-        // Suggest chatting with the first uploaded document
-        if (uploadedCount > 0 && data.uploaded_documents[0]?.document_id) {
-            const firstDoc = data.uploaded_documents[0];
-            showModal(
-                "Unggah Selesai",
-                `Dokumen "${sanitizeText(firstDoc.filename)}" berhasil diunggah. Apakah Anda ingin langsung chat dengan dokumen ini?`,
-                () => {
-                    selectedChatDocumentId = firstDoc.document_id;
-                    navigateToSection('chat'); // Navigate to chat section on confirmation
-                }
-            );
+        // Text extraction runs in the background; notify the user when it finishes
+        if (uploadedCount > 0) {
+            notifyWhenDocumentsProcessed(data.uploaded_documents);
         }
 
     } catch (error) {
@@ -517,6 +592,69 @@ async function performUploadDocuments() {
     }
 }
 
+/**
+ * Polls the processing status of uploaded documents until background extraction finishes.
+ * @param {Array<Object>} uploadedDocs - Documents returned by the /upload endpoint.
+ * @returns {Promise<Array<Object>>} Final status objects (status 'ready' or 'failed').
+ */
+async function waitForDocumentProcessing(uploadedDocs) {
+    const pendingIds = new Set(uploadedDocs.map(doc => doc.document_id));
+    const finished = [];
+
+    while (pendingIds.size > 0) {
+        await new Promise(resolve => setTimeout(resolve, STATUS_POLL_INTERVAL_MS));
+        for (const docId of Array.from(pendingIds)) {
+            try {
+                const statusData = await apiCall(`/documents/${docId}/status`);
+                if (statusData.status !== 'processing') {
+                    pendingIds.delete(docId);
+                    finished.push(statusData);
+                }
+            } catch (error) {
+                // Document may have been deleted while processing; stop polling it
+                console.warn('Gagal memeriksa status dokumen:', error.message);
+                pendingIds.delete(docId);
+            }
+        }
+    }
+    return finished;
+}
+
+/**
+ * Notifies the user once uploaded documents are processed and offers to chat with the first one.
+ * @param {Array<Object>} uploadedDocs - Documents returned by the /upload endpoint.
+ */
+async function notifyWhenDocumentsProcessed(uploadedDocs) {
+    const results = await waitForDocumentProcessing(uploadedDocs);
+    const readyDocs = results.filter(result => result.status === 'ready');
+    const failedDocs = results.filter(result => result.status === 'failed');
+
+    failedDocs.forEach(result => {
+        showAlert(`Dokumen "${sanitizeText(result.filename)}" gagal diproses.`, 'error', 7000);
+    });
+
+    // Refresh visible document lists so new documents appear as ready
+    if (elements.contentSections.documents.classList.contains('active')) {
+        await loadUserDocuments();
+    }
+    if (elements.contentSections.chat.classList.contains('active')) {
+        await loadDocumentsForChat();
+    }
+
+    // Suggest chatting with the first processed document
+    if (readyDocs.length > 0) {
+        const firstDoc = readyDocs[0];
+        showModal(
+            "Pemrosesan Selesai",
+            `Dokumen "${sanitizeText(firstDoc.filename)}" siap digunakan. Apakah Anda ingin langsung chat dengan dokumen ini?`,
+            () => {
+                selectedChatDocumentId = firstDoc.document_id;
+                navigateToSection('chat'); // Navigate to chat section on confirmation
+            }
+        );
+    }
+}
+
 // --- DOCUMENTS SECTION FUNCTIONS ---
 
 /**
@@ -524,9 +662,20 @@ async function performUploadDocuments() {
  */
 async function loadUserDocuments() {
     try {
-        const data = await apiCall('/documents');
-        allMainDocuments = data.documents || []; // Store for search functionality
-        renderDocumentList(allMainDocuments, elements.documentsContainer, false); // Render in documents section
+        documentsPager = documentsPager || createPager({
+            endpoint: '/documents',
+            itemsKey: 'documents',
+            container: elements.documentsContainer,
+            onPage: (documents, isFirstPage) => {
+                allMainDocuments = isFirstPage ? documents : allMainDocuments.concat(documents);
+                if (isFirstPage && documents.length === 0 && elements.mainDocumentSearchInput?.value.trim()) {
+                    renderEmptyState(elements.documentsContainer, 'Tidak ada dokumen yang cocok dengan pencarian.');
+                    return;
+                }
+                renderDocumentList(documents, elements.documentsContainer, false, !isFirstPage); // Render in documents section
+            }
+        });
+        await documentsPager.reset({ q: elements.mainDocumentSearchInput?.value.trim() || '' });
     } catch (error) {
         showAlert(`Gagal memuat dokumen: ${error.message}`, 'error', 7000);
         renderEmptyState(elements.documentsContainer, 'Gagal memuat dokumen yang tersedia.');
@@ -538,11 +687,16 @@ async function loadUserDocuments() {
  * @param {Array<Object>} documents - Array of document objects.
  * @param {HTMLElement} containerElement - The DOM element to render documents into.
  * @param {boolean} isAdminView - True if rendering for admin view (shows delete button).
+ * @param {boolean} append - True to add a further page below the documents already shown.
  */
-function renderDocumentList(documents, containerElement, isAdminView = false) {
+function renderDocumentList(documents, containerElement, isAdminView = false, append = false) {
     if (!containerElement) return;
 
-    containerElement.innerHTML = ''; // Clear existing content
+    if (append) {
+        if (!documents || documents.length === 0) return;
+    } else {
+        containerElement.innerHTML = ''; // Clear existing content
+    }
 
     if (!documents || documents.length === 0) {
         renderEmptyState(containerElement, isAdminView ? 'Tidak ada dokumen di sistem.' : 'Anda belum mengunggah dokumen.');
@@ -556,6 +710,7 @@ function renderDocumentList(documents, containerElement, isAdminView = false) {
         docCard.setAttribute('aria-labelledby', `doc-title-${doc.id}`);
 
         const fileSizeMB = doc.file_size ? (doc.file_size / 1024 / 1024).toFixed(2) : 'N/A';
+        const statusLabel = doc.status === 'processing' ? ' • Sedang diproses...' : (doc.status === 'failed' ? ' • Gagal diproses' : '');
 
         // Selalu tampilkan tombol hapus, baik di admin view maupun user view
         const deleteButtonHtml = `
@@ -569,7 +724,7 @@ function renderDocumentList(documents, containerElement, isAdminView = false) {
         docCard.innerHTML = `
             <div class="document-header">
                 <h3 class="document-title" id="doc-title-${doc.id}">${sanitizeText(doc.filename)}</h3>
-                <p class="document-meta">Diupload: ${formatDate(doc.upload_date)} • Ukuran: ${fileSizeMB} MB</p>
+                <p class="document-meta">Diupload: ${formatDate(doc.upload_date)} • Ukuran: ${fileSizeMB} MB${statusLabel}</p>
             </div>
             <div class="document-actions">${chatButtonHtml} ${deleteButtonHtml}</div>
         `;
@@ -639,14 +794,32 @@ async function handleDocumentCardAction(action, documentId, documentFilename) {
  */
 async function loadDocumentsForChat() {
     try {
-        const data = await apiCall('/documents');
-        renderChatDocumentSelectionList(data.documents || []);
+        chatDocumentsPager = chatDocumentsPager || createPager({
+            endpoint: '/documents',
+            itemsKey: 'documents',
+            container: elements.chatDocumentList,
+            onPage: (documents, isFirstPage) => {
+                const loadedDocuments = isFirstPage ? documents : allChatDocuments.concat(documents);
+                const searchQuery = elements.documentSearchInput?.value.trim() || '';
+                if (searchQuery) {
+                    allChatDocuments = loadedDocuments;
+                    filterChatDocuments(searchQuery); // Keep the active search applied to newly loaded pages
+                } else {
+                    renderChatDocumentSelectionList(loadedDocuments);
+                }
+            }
+        });
+        await chatDocumentsPager.reset({ fields: 'id,filename,status' });
 
         // If a document was previously selected for chat, try to re-select it
         if (selectedChatDocumentId) {
-            const stillExists = (data.documents || []).some(doc => doc.id === selectedChatDocumentId);
+            let selectedDocForChat = allChatDocuments.find(doc => doc.id === selectedChatDocumentId);
+            if (!selectedDocForChat) {
+                // The selected document may be on a page that has not been loaded yet
+                selectedDocForChat = await apiCall(`/documents/${selectedChatDocumentId}/status`).catch(() => null);
+            }
+            const stillExists = Boolean(selectedDocForChat);
             if (stillExists) {
-                const selectedDocForChat = (data.documents || []).find(doc => doc.id === selectedChatDocumentId);
                 activateChatWithDocument(selectedChatDocumentId, selectedDocForChat?.filename);
                 // Ensure the UI element for the selected doc gets 'selected' class
                 const itemToSelect = elements.chatDocumentList.querySelector(`.chat-document-item[data-doc-id='${selectedChatDocumentId}']`);
@@ -678,10 +851,12 @@ function renderChatDocumentSelectionList(documents) {
         allChatDocuments = documents || []; // Store for search functionality
     }
     
+    const pageSentinel = elements.chatDocumentList.querySelector('.list-sentinel'); // Kept so further pages still load
     elements.chatDocumentList.innerHTML = ''; // Clear current list
 
     if (!documents || documents.length === 0) {
         renderEmptyState(elements.chatDocumentList, 'Belum ada dokumen untuk dichat. Unggah dokumen baru!');
+        if (pageSentinel) elements.chatDocumentList.appendChild(pageSentinel);
         return;
     }
 
@@ -712,6 +887,7 @@ function renderChatDocumentSelectionList(documents) {
         }
         elements.chatDocumentList.appendChild(docItem);
     });
+    if (pageSentinel) elements.chatDocumentList.appendChild(pageSentinel);
 }
 
 /**
@@ -756,17 +932,11 @@ function filterChatDocuments(searchQuery, customDocumentList = null) {
  * @param {string} searchQuery - The search query string.
  */
 function filterMainDocuments(searchQuery) {
-    if (!searchQuery.trim()) {
-        // Reset to show all documents when search is cleared
-        renderDocumentList(allMainDocuments, elements.documentsContainer, false);
-        return;
-    }
-
-    const filteredDocs = allMainDocuments.filter(doc => 
-        doc.filename.toLowerCase().includes(searchQuery.toLowerCase())
-    );
-
-    renderDocumentList(filteredDocs, elements.documentsContainer, false);
+    // Filtering runs on the server so documents on pages not loaded yet are found too
+    clearTimeout(mainSearchTimeout);
+    mainSearchTimeout = setTimeout(() => {
+        loadUserDocuments();
+    }, SEARCH_DEBOUNCE_MS);
 }
 
 /**
@@ -777,6 +947,7 @@ function filterMainDocuments(searchQuery) {
 function activateChatWithDocument(docId, docFilename) {
     selectedChatDocumentId = docId;
     currentChatSessionMessages = []; // Clear previous chat messages
+    startNewChatSession();
 
     // Update UI to highlight selected document in both desktop and mobile views
     document.querySelectorAll('#chat-document-list .chat-document-item, #mobile-chat-document-list .chat-document-item').forEach(item => {
@@ -802,12 +973,22 @@ function activateChatWithDocument(docId, docFilename) {
     loadPredefinedQuestionsForDocument(docId); // Load predefined questions for the document
 }
 
+/**
+ * Starts a new server-side conversation so earlier turns are no longer used as context.
+ */
+function startNewChatSession() {
+    apiCall('/chat/session', { method: 'POST' }).catch(() => {
+        // The previous conversation stays in use; chatting still works
+    });
+}
+
 /**
  * Resets the chat UI to its initial state (no document selected).
  */
 function resetChatUI() {
     selectedChatDocumentId = null;
     currentChatSessionMessages = []; // Clear messages
+    startNewChatSession();
 
     // Disable and reset chat input
     if(elements.chatInput) {
@@ -912,6 +1093,7 @@ function renderChatMessageHistoryUI() {
  * @param {'user'|'assistant'} sender - Who sent the message.
  * @param {string} timestamp - ISO string timestamp of the message.
  * @param {boolean} scrollToBottom - Whether to scroll the chat window to the bottom.
+ * @returns {{contentDiv: HTMLElement, messageRecord: Object}|undefined} Handles for updating a streamed message.
  */
 function addMessageToChatUI(content, sender, timestamp, scrollToBottom = true) {
     if (!elements.chatMessagesContainer) return;
@@ -933,11 +1115,64 @@ function addMessageToChatUI(content, sender, timestamp, scrollToBottom = true) {
     elements.chatMessagesContainer.appendChild(messageDiv);
 
     // Keep track of messages in the session
-    currentChatSessionMessages.push({ content, sender, timestamp });
+    const messageRecord = { content, sender, timestamp };
+    currentChatSessionMessages.push(messageRecord);
 
     if (scrollToBottom) {
         elements.chatMessagesContainer.scrollTop = elements.chatMessagesContainer.scrollHeight;
     }
+    return { contentDiv, messageRecord };
+}
+
+/**
+ * Sends a chat message to the streaming endpoint and reports generated text as it arrives.
+ * @param {Object} payload - The chat request body (message, document_ids, is_predefined).
+ * @param {Function} onDelta - Called with each new piece of text.
+ * @returns {Promise<Object>} The final 'done' event data containing the full response.
+ * @throws {Error} If the request fails or the server sends an 'error' event.
+ */
+async function streamChatMessage(payload, onDelta) {
+    const response = await fetch(`${API_BASE_URL}/chat/stream`, {
+        method: 'POST',
+        credentials: 'include',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(payload),
+    });
+    if (!response.ok || !response.body) {
+        throw new Error(`Server error: ${response.status} ${response.statusText}.`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let finalData = null;
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        // Server-Sent Events are separated by a blank line
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const rawEvent = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let eventName = 'message';
+            let data = '';
+            rawEvent.split('\n').forEach(line => {
+                if (line.startsWith('event:')) eventName = line.slice(6).trim();
+                else if (line.startsWith('data:')) data += line.slice(5).trim();
+            });
+            if (!data) continue;
+
+            const parsed = JSON.parse(data);
+            if (eventName === 'error') throw new Error(parsed.detail);
+            if (eventName === 'done') finalData = parsed;
+            else if (eventName === 'message') onDelta(parsed.delta);
+        }
+    }
+    return finalData;
 }
 
 /**
@@ -962,19 +1197,27 @@ async function submitChatMessage(messageContent, isPredefined = false) {
     setButtonLoading(elements.chatSendBtn, true, "Kirim");
     if (elements.chatInput) elements.chatInput.disabled = true; // Disable input while AI is thinking
 
+    // The assistant message is rendered incrementally as the answer streams in
+    const { contentDiv, messageRecord } = addMessageToChatUI('', 'assistant', new Date().toISOString());
+
     try {
-        const responseData = await apiCall('/chat', {
-            method: 'POST',
-            body: JSON.stringify({
-                message: messageContent,
-                document_ids: [selectedChatDocumentId], // Send selected doc ID
-                is_predefined: isPredefined
-            }),
+        const finalData = await streamChatMessage({
+            message: messageContent,
+            document_ids: [selectedChatDocumentId], // Send selected doc ID
+            is_predefined: isPredefined
+        }, delta => {
+            messageRecord.content += delta;
+            contentDiv.textContent = messageRecord.content;
+            elements.chatMessagesContainer.scrollTop = elements.chatMessagesContainer.scrollHeight;
         });
-        addMessageToChatUI(responseData.response, 'assistant', new Date().toISOString());
+        if (finalData && finalData.response) {
+            messageRecord.content = finalData.response;
+            contentDiv.textContent = finalData.response;
+        }
     } catch (error) {
         showAlert(`Error Chat: ${error.message}`, 'error', 7000);
-        addMessageToChatUI('Maaf, terjadi kesalahan internal saat memproses pertanyaan Anda. Silakan coba lagi.', 'assistant', new Date().toISOString());
+        messageRecord.content = 'Maaf, terjadi kesalahan internal saat memproses pertanyaan Anda. Silakan coba lagi.';
+        contentDiv.textContent = messageRecord.content;
     } finally {
         setButtonLoading(elements.chatSendBtn, false, "Kirim");
         if (elements.chatInput) {
@@ -991,8 +1234,14 @@ async function submitChatMessage(messageContent, isPredefined = false) {
  */
 async function loadUserChatHistory() {
     try {
-        const data = await apiCall('/history');
-        renderChatHistoryList(data.history || []);
+        historyPager = historyPager || createPager({
+            endpoint: '/history',
+            itemsKey: 'history',
+            container: elements.historyContainer,
+            pageSize: HISTORY_PAGE_SIZE,
+            onPage: (historyItems, isFirstPage) => renderChatHistoryList(historyItems, !isFirstPage)
+        });
+        await historyPager.reset();
     } catch (error) {
         showAlert(`Gagal memuat riwayat chat: ${error.message}`, 'error', 7000);
         renderEmptyState(elements.historyContainer, 'Gagal memuat riwayat percakapan Anda.');
@@ -1002,14 +1251,17 @@ async function loadUserChatHistory() {
 /**
  * Renders the list of chat history items.
  * @param {Array<Object>} historyItems - Array of chat history objects.
+ * @param {boolean} append - True to add a further page below the items already shown.
  */
-function renderChatHistoryList(historyItems) {
+function renderChatHistoryList(historyItems, append = false) {
     if (!elements.historyContainer) return;
 
-    elements.historyContainer.innerHTML = ''; // Clear existing content
+    if (!append) {
+        elements.historyContainer.innerHTML = ''; // Clear existing content
+    }
 
     // Add "Clear All" button if there are history items
-    if (historyItems && historyItems.length > 0) {
+    if (!append && historyItems && historyItems.length > 0) {
         const clearAllBtn = document.createElement('button');
         clearAllBtn.className = 'btn btn-danger btn-small';
         clearAllBtn.style.marginBottom = '1.5rem';
@@ -1028,7 +1280,7 @@ function renderChatHistoryList(historyItems) {
     }
 
     if (!historyItems || historyItems.length === 0) {
-        renderEmptyState(elements.historyContainer, 'Belum ada riwayat chat yang tersimpan.');
+        if (!append) renderEmptyState(elements.historyContainer, 'Belum ada riwayat chat yang tersimpan.');
         return;
     }
 
@@ -1207,8 +1459,13 @@ async function switchAdminTab(tabName, forceLoad = false) {
  */
 async function loadAdminAllDocuments() {
     try {
-        const data = await apiCall('/admin/documents?is_admin_query=true');
-        renderDocumentList(data.documents || [], elements.adminDocumentsList, true); // Use true for isAdminView
+        adminDocumentsPager = adminDocumentsPager || createPager({
+            endpoint: '/admin/documents',
+            itemsKey: 'documents',
+            container: elements.adminDocumentsList,
+            onPage: (documents, isFirstPage) => renderDocumentList(documents, elements.adminDocumentsList, true, !isFirstPage) // Use true for isAdminView
+        });
+        await adminDocumentsPager.reset({ is_admin_query: true });
     } catch (error) {
         showAlert(`Gagal memuat daftar semua dokumen (admin): ${error.message}`, 'error', 7000);
         renderEmptyState(elements.adminDocumentsList, 'Gagal memuat daftar dokumen.');
@@ -0,0 +1,53 @@
+"""
+Mengukur berapa banyak panggilan LLM bersamaan yang dapat ditangani GroqClient.
+
+Jalankan server stub terlebih dahulu (dengan latensi buatan), lalu:
+
+    python scripts/stub_groq_server.py --port 9000 --delay 0.5
+    python scripts/bench_llm_concurrency.py --url http://127.0.0.1:9000/openai/v1/chat/completions --requests 200
+
+Dengan pool keep-alive, waktu total mendekati satu kali latensi stub, bukan
+jumlah permintaan x latensi.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from llm_client import GroqClient
+
+
+async def run(url: str, total: int, max_connections: int):
+    client = GroqClient("stub", url, max_connections=max_connections, max_keepalive_connections=max_connections)
+    messages = [{"role": "user", "content": "Apa kesimpulan dari dokumen ini?"}]
+    latencies = []
+
+    async def one_call():
+        start = time.perf_counter()
+        await client.chat_completion(messages, model="llama-3.3-70b-versatile", max_tokens=50)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_call() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+    await client.close()
+
+    latencies.sort()
+    print(f"{total} permintaan, max_connections={max_connections}: total {elapsed:.2f}s, "
+          f"p50 {latencies[len(latencies) // 2] * 1000:.0f}ms, p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:.0f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:9000/openai/v1/chat/completions")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--max-connections", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.requests, args.max_connections))
+
+
+if __name__ == "__main__":
+    main()
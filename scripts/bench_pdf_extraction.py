@@ -0,0 +1,72 @@
+"""
+Benchmark ekstraksi PDF paralel per halaman.
+
+Membuat PDF sintetis berisi ratusan halaman (teks dan tabel bergaris pada
+sebagian halaman), lalu mengukur waktu extract_text_and_tables_from_pdf
+untuk beberapa jumlah worker.
+
+Penggunaan:
+    python scripts/bench_pdf_extraction.py --pages 400 --workers 1 2 4 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import fitz  # PyMuPDF
+
+from extraction import extract_text_and_tables_from_pdf
+
+
+def build_synthetic_pdf(path: str, pages: int, table_every: int = 3):
+    """Membuat PDF dengan 40 baris teks per halaman dan tabel 6x4 setiap `table_every` halaman."""
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page()
+        y = 60
+        for line in range(40):
+            page.insert_text((50, y), f"Arsip halaman {page_num + 1} baris {line + 1}: Surat Keputusan Nomor {page_num * 40 + line}/ARPUS/{1990 + page_num % 30}", fontsize=8)
+            y += 10
+        if page_num % table_every == 0:
+            x0, y0 = 50, 480
+            for r in range(6):
+                for c in range(4):
+                    rect = fitz.Rect(x0 + c * 120, y0 + r * 18, x0 + (c + 1) * 120, y0 + (r + 1) * 18)
+                    page.draw_rect(rect)
+                    label = f"Kolom {c + 1}" if r == 0 else f"Nilai {r}.{c}"
+                    page.insert_text((rect.x0 + 4, rect.y0 + 12), label, fontsize=8)
+    doc.save(path)
+    doc.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--table-detection", default="ruled", choices=["ruled", "always", "never"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "synthetic.pdf")
+        build_synthetic_pdf(path, args.pages)
+        print(f"PDF sintetis: {args.pages} halaman, CPU tersedia: {os.cpu_count()}")
+
+        baseline = None
+        reference = None
+        for workers in args.workers:
+            start = time.perf_counter()
+            text = extract_text_and_tables_from_pdf(path, workers=workers, table_detection=args.table_detection)
+            elapsed = time.perf_counter() - start
+
+            baseline = baseline or elapsed
+            reference = reference if reference is not None else text
+            same = "ya" if text == reference else "TIDAK"
+            print(f"workers={workers:<3} waktu={elapsed:7.2f}s  speedup={baseline / elapsed:5.2f}x  "
+                  f"karakter={len(text)}  hasil sama={same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Micro-benchmark penyusunan anggaran prompt.
+
+Membuat kandidat chunk sintetis untuk beberapa dokumen (dengan jumlah token
+yang sudah dihitung seperti saat unggah), lalu mengukur waktu plan_prompt
+dan penghitungan token bagian tetap prompt. Targetnya tetap di bawah
+1 milidetik per permintaan meskipun kandidatnya ribuan chunk.
+
+Penggunaan:
+    python scripts/bench_prompt_budget.py --documents 5 --chunks 2000 --iterations 2000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from prompt_budget import ModelSpec, count_static_tokens, plan_prompt
+from retrieval import Chunk, estimate_tokens
+
+FIXED_TEXT = (
+    "Anda adalah asisten analisis dokumen yang membantu staf dan publik di Dinas Kearsipan dan "
+    "Perpustakaan Provinsi Jawa Tengah. Selalu gunakan Bahasa Indonesia yang baik dan formal. "
+) * 12
+
+
+def build_candidates(documents: int, chunks_per_document: int, seed: int = 7):
+    """Kandidat terurut skor menurun, seperti keluaran retrieval.rank_chunks."""
+    rng = random.Random(seed)
+    candidates = []
+    for d in range(documents):
+        doc_id = f"doc-{d}"
+        for i in range(chunks_per_document):
+            chunk = Chunk(
+                chunk_index=i,
+                content="",
+                page_number=i // 3 + 1,
+                kind="text",
+                token_count=rng.randint(80, 350),
+                term_freqs={},
+            )
+            candidates.append((doc_id, chunk, rng.random() * (documents - d)))
+    candidates.sort(key=lambda c: c[2], reverse=True)
+    return candidates
+
+
+def timed(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=5)
+    parser.add_argument("--chunks", type=int, default=2000, help="Jumlah chunk kandidat per dokumen")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--context-cap", type=int, default=3000)
+    parser.add_argument("--top-k", type=int, default=8)
+    args = parser.parse_args()
+
+    candidates = build_candidates(args.documents, args.chunks)
+    models = [ModelSpec("llama-3.1-8b-instant", 8192), ModelSpec("llama-3.3-70b-versatile", 131072)]
+    fixed_tokens = estimate_tokens(FIXED_TEXT)
+
+    print(f"{len(candidates)} kandidat dari {args.documents} dokumen, teks tetap {len(FIXED_TEXT)} karakter ({fixed_tokens} token)")
+
+    count_us = timed(lambda: estimate_tokens(FIXED_TEXT), args.iterations)
+    cached_us = timed(lambda: count_static_tokens(FIXED_TEXT), args.iterations)
+    question_us = timed(lambda: estimate_tokens("Apa kesimpulan dari dokumen ini?"), args.iterations)
+    print(f"estimate_tokens bagian tetap: {count_us:8.1f} us (tercache: {cached_us:.2f} us), pertanyaan: {question_us:.1f} us")
+
+    for cap in (args.context_cap, args.context_cap * 10):
+        plan = plan_prompt(candidates, fixed_tokens, models, max_tokens=1500, context_cap=cap, top_k=args.top_k)
+        plan_us = timed(
+            lambda: plan_prompt(candidates, fixed_tokens, models, max_tokens=1500, context_cap=cap, top_k=args.top_k),
+            args.iterations,
+        )
+        print(f"plan_prompt context_cap={cap:<6} {plan_us:8.1f} us  "
+              f"chunk={len(plan.context)}  prompt_tokens={plan.prompt_tokens}  alokasi={plan.allocations}")
+
+
+if __name__ == "__main__":
+    main()
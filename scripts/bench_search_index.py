@@ -0,0 +1,111 @@
+"""
+Benchmark indeks pencarian teks penuh (search_index.SearchIndex).
+
+Membuat korpus sintetis (ribuan dokumen, puluhan chunk per dokumen) dengan
+kosakata berdistribusi Zipf, lalu mengukur waktu membangun delta, merge ke
+segmen di disk, membuka ulang segmen (memory-map), serta latensi pencarian
+dibandingkan menilai BM25 atas semua chunk tanpa indeks.
+
+Penggunaan:
+    python scripts/bench_search_index.py --documents 5000 --chunks 40
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from retrieval import BM25Index
+from search_index import IndexedChunk, SearchIndex
+
+
+def build_corpus(documents: int, chunks: int, vocabulary: int, terms_per_chunk: int, seed: int = 1):
+    """Dokumen sintetis: term umum sering muncul, nama dan tahun jarang (mirip arsip)."""
+    rng = random.Random(seed)
+    words = [f"kata{i}" for i in range(vocabulary)]
+    cum_weights, total = [], 0.0
+    for rank in range(vocabulary):
+        total += 1 / (rank + 1)
+        cum_weights.append(total)
+    corpus = {}
+    for d in range(documents):
+        doc_chunks = []
+        for c in range(chunks):
+            terms = Counter(rng.choices(words, cum_weights=cum_weights, k=terms_per_chunk))
+            terms[f"nama{rng.randrange(documents)}"] += 1
+            terms[str(1950 + rng.randrange(75))] += 1
+            doc_chunks.append(IndexedChunk(c, c // 2 + 1, dict(terms)))
+        corpus[f"dok-{d}"] = doc_chunks
+    return corpus
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=5000)
+    parser.add_argument("--chunks", type=int, default=40)
+    parser.add_argument("--vocabulary", type=int, default=30000)
+    parser.add_argument("--terms-per-chunk", type=int, default=60)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    corpus = build_corpus(args.documents, args.chunks, args.vocabulary, args.terms_per_chunk)
+    total_chunks = args.documents * args.chunks
+    print(f"Korpus: {args.documents} dokumen x {args.chunks} chunk = {total_chunks} chunk ({time.perf_counter() - start:.1f}s)")
+
+    rng = random.Random(2)
+    queries = [
+        f"nama{rng.randrange(args.documents)} {1950 + rng.randrange(75)} kata{rng.randrange(50)}"
+        for _ in range(args.queries)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = SearchIndex(tmp, merge_threshold=total_chunks + 1)
+        index.open()
+        start = time.perf_counter()
+        for doc_id, chunks in corpus.items():
+            index.add_document(doc_id, chunks)
+        print(f"Tambah ke delta:   {time.perf_counter() - start:6.2f}s")
+
+        start = time.perf_counter()
+        index.merge()
+        size = sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(tmp) for name in names)
+        print(f"Merge ke disk:     {time.perf_counter() - start:6.2f}s  ({size / 1024 / 1024:.1f} MB)")
+
+        start = time.perf_counter()
+        reopened = SearchIndex(tmp)
+        reopened.open()
+        print(f"Buka ulang (mmap): {time.perf_counter() - start:6.2f}s")
+
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            reopened.search(query, limit=20)
+            latencies.append((time.perf_counter() - start) * 1000)
+        print(f"Cari dengan indeks: p50={statistics.median(latencies):7.2f} ms  p95={percentile(latencies, 0.95):7.2f} ms")
+
+        # Tanpa indeks: skor BM25 atas semua chunk untuk setiap pertanyaan (beberapa pertanyaan saja)
+        pairs = [chunk.term_freqs for chunks in corpus.values() for chunk in chunks]
+        start = time.perf_counter()
+        bm25 = BM25Index(pairs)
+        build_seconds = time.perf_counter() - start
+        latencies = []
+        for query in queries[:5]:
+            start = time.perf_counter()
+            bm25.scores(query)
+            latencies.append((time.perf_counter() - start) * 1000)
+        print(f"Tanpa indeks:       p50={statistics.median(latencies):7.2f} ms  (+{build_seconds:.1f}s membangun statistik)")
+
+
+if __name__ == "__main__":
+    main()
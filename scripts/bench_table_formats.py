@@ -0,0 +1,78 @@
+"""
+Membandingkan format teks tabel PDF: markdown, csv, dan sentences.
+
+Membuat PDF sintetis berisi tabel bergaris (misalnya daftar arsip 500 baris
+yang terpecah di beberapa halaman), lalu untuk setiap format mengukur waktu
+ekstraksi, jumlah karakter dan perkiraan token teks hasil ekstraksi, jumlah
+chunk, serta token rata-rata chunk tabel yang masuk ke prompt.
+
+Penggunaan:
+    python scripts/bench_table_formats.py --rows 500 --columns 6
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import fitz  # PyMuPDF
+
+from extraction import TABLE_FORMATS, extract_text_and_tables_from_pdf
+from retrieval import chunk_document, estimate_tokens
+
+ROWS_PER_PAGE = 30
+HEADERS = ["No", "Kode Arsip", "Uraian", "Tahun", "Jumlah", "Keterangan", "Lokasi", "Status"]
+
+
+def build_table_pdf(path: str, rows: int, columns: int):
+    """Membuat PDF berisi satu tabel bergaris per halaman, ROWS_PER_PAGE baris data per tabel."""
+    headers = HEADERS[:columns]
+    doc = fitz.open()
+    col_width = (595 - 80) / columns
+    for start in range(0, rows, ROWS_PER_PAGE):
+        page = doc.new_page()
+        page.insert_text((40, 40), f"Daftar Arsip Inaktif, baris {start + 1} sampai {min(rows, start + ROWS_PER_PAGE)}", fontsize=9)
+        table_rows = [headers] + [
+            [str(n + 1), f"AR.{n:05d}", f"Surat keputusan {n % 37}", str(1980 + n % 40), str(n % 12 + 1), "Baik", f"Rak {n % 9}", "Inaktif"][:columns]
+            for n in range(start, min(rows, start + ROWS_PER_PAGE))
+        ]
+        for r, cells in enumerate(table_rows):
+            for c, cell in enumerate(cells):
+                rect = fitz.Rect(40 + c * col_width, 60 + r * 22, 40 + (c + 1) * col_width, 60 + (r + 1) * 22)
+                page.draw_rect(rect)
+                page.insert_text((rect.x0 + 3, rect.y0 + 14), cell, fontsize=7)
+    doc.save(path)
+    doc.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--columns", type=int, default=6, choices=range(2, len(HEADERS) + 1))
+    parser.add_argument("--chunk-tokens", type=int, default=350)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tables.pdf")
+        build_table_pdf(path, args.rows, args.columns)
+        print(f"PDF sintetis: {args.rows} baris x {args.columns} kolom")
+
+        baseline = None
+        for table_format in TABLE_FORMATS:
+            start = time.perf_counter()
+            text = extract_text_and_tables_from_pdf(path, table_format=table_format)
+            elapsed = time.perf_counter() - start
+
+            tokens = estimate_tokens(text)
+            baseline = baseline or tokens
+            chunks = chunk_document(text, max_tokens=args.chunk_tokens)
+            table_chunks = [chunk for chunk in chunks if chunk.kind == "table"]
+            rows_per_chunk = args.rows / len(table_chunks) if table_chunks else 0
+            print(f"{table_format:<10} waktu={elapsed:6.2f}s  karakter={len(text):>8}  token={tokens:>7} "
+                  f"({tokens / baseline:4.2f}x)  chunk tabel={len(table_chunks):>4}  baris/chunk={rows_per_chunk:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
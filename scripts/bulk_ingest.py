@@ -0,0 +1,116 @@
+"""
+Mengunggah seluruh folder (atau arsip ZIP) ke endpoint /upload/bulk.
+
+Berkas dikirim per kelompok --batch-size dalam satu permintaan multipart,
+dan kemajuan tiap berkas dicetak dari event SSE yang dikirim server. Dengan
+--wait, skrip menunggu sampai ekstraksi semua dokumen selesai.
+
+Penggunaan:
+    python scripts/bulk_ingest.py arsip/2023 arsip/2024.zip --url http://localhost:8000
+    python scripts/bulk_ingest.py arsip --batch-size 200 --wait
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+import httpx
+
+SUPPORTED_SUFFIXES = {".pdf", ".docx", ".doc", ".txt", ".zip"}
+
+
+def collect_files(paths):
+    """Berkas yang didukung dari argumen; folder ditelusuri secara rekursif."""
+    files = []
+    for path in map(Path, paths):
+        candidates = sorted(path.rglob("*")) if path.is_dir() else [path]
+        files.extend(p for p in candidates if p.is_file() and p.suffix.lower() in SUPPORTED_SUFFIXES)
+    return files
+
+
+def iter_sse(response):
+    """Menghasilkan (event, data) dari respons text/event-stream."""
+    event, data = None, []
+    for line in response.iter_lines():
+        if line.startswith("event:"):
+            event = line[6:].strip()
+        elif line.startswith("data:"):
+            data.append(line[5:].strip())
+        elif not line and data:
+            yield event, json.loads("\n".join(data))
+            event, data = None, []
+
+
+def upload_batch(client, url, batch, totals, document_ids):
+    with ExitStack() as stack:
+        parts = [("files", (p.name, stack.enter_context(open(p, "rb")))) for p in batch]
+        with client.stream("POST", f"{url}/upload/bulk", files=parts) as response:
+            if response.status_code != 200:
+                response.read()
+                print(f"Gagal mengunggah {len(batch)} berkas: HTTP {response.status_code} {response.text}")
+                totals["failed"] += len(batch)
+                return
+            for event, data in iter_sse(response):
+                if event == "file":
+                    detail = data.get("detail") or ("duplikat" if data.get("deduplicated") else "")
+                    print(f"[{data['index']}/{data['total']}] {data['status']:<10} {data['filename']} {detail}")
+                    if data.get("document_id") and data["status"] == "processing":
+                        document_ids.append(data["document_id"])
+                elif event == "done":
+                    for key in ("uploaded", "deduplicated", "skipped", "failed"):
+                        totals[key] += data[key]
+
+
+def wait_for_extraction(client, url, document_ids, interval):
+    pending = list(document_ids)
+    failed = 0
+    while pending:
+        still_pending = []
+        for doc_id in pending:
+            status = client.get(f"{url}/documents/{doc_id}/status").json().get("status")
+            if status == "processing":
+                still_pending.append(doc_id)
+            elif status == "failed":
+                failed += 1
+        if still_pending:
+            print(f"Menunggu ekstraksi: {len(still_pending)} dokumen tersisa")
+            time.sleep(interval)
+        pending = still_pending
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="Folder, berkas dokumen, atau arsip ZIP")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--batch-size", type=int, default=100, help="Jumlah berkas per permintaan")
+    parser.add_argument("--wait", action="store_true", help="Tunggu sampai ekstraksi selesai")
+    parser.add_argument("--poll-interval", type=float, default=2.0)
+    args = parser.parse_args()
+
+    files = collect_files(args.paths)
+    if not files:
+        print("Tidak ada berkas yang didukung.")
+        sys.exit(1)
+
+    url = args.url.rstrip("/")
+    totals = {"uploaded": 0, "deduplicated": 0, "skipped": 0, "failed": 0}
+    document_ids = []
+    start = time.perf_counter()
+    with httpx.Client(timeout=None) as client:
+        for offset in range(0, len(files), args.batch_size):
+            upload_batch(client, url, files[offset:offset + args.batch_size], totals, document_ids)
+        elapsed = time.perf_counter() - start
+        print(f"{totals['uploaded']} diunggah ({totals['deduplicated']} duplikat), {totals['skipped']} dilewati, "
+              f"{totals['failed']} gagal dalam {elapsed:.1f}s ({totals['uploaded'] / max(elapsed, 1e-9):.1f} berkas/detik)")
+
+        if args.wait and document_ids:
+            failed = wait_for_extraction(client, url, document_ids, args.poll_interval)
+            print(f"Ekstraksi selesai dalam {time.perf_counter() - start:.1f}s, {failed} gagal")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Server stub lokal yang meniru endpoint chat completions Groq (kompatibel OpenAI).
+
+Berguna untuk menguji klien LLM dan endpoint /chat tanpa kunci API dan tanpa
+memakai kuota. Jalankan server ini, lalu arahkan aplikasi ke sana:
+
+    python scripts/stub_groq_server.py --port 9000 --delay 0.5
+    GROQ_API_URL=http://127.0.0.1:9000/openai/v1/chat/completions GROQ_API_KEY=stub uvicorn app:app
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+stub_app = FastAPI(title="Stub Groq API")
+settings = {"delay": 0.0, "status": 200, "token_delay": 0.02}
+
+
+def _completion_body(model: str, content: str, prompt_tokens: int) -> dict:
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(content.split()),
+            "total_tokens": prompt_tokens + len(content.split()),
+        },
+    }
+
+
+@stub_app.get("/openai/v1/models")
+async def list_models():
+    if settings["status"] != 200:
+        return JSONResponse({"error": {"message": "stub error"}}, status_code=settings["status"])
+    return {"object": "list", "data": [{"id": "llama-3.3-70b-versatile", "object": "model", "owned_by": "stub"}]}
+
+
+@stub_app.post("/openai/v1/chat/completions")
+async def chat_completions(request: Request):
+    payload = await request.json()
+    await asyncio.sleep(settings["delay"])
+
+    if settings["status"] != 200:
+        headers = {"retry-after": "1"} if settings["status"] == 429 else {}
+        return JSONResponse({"error": {"message": "stub error"}}, status_code=settings["status"], headers=headers)
+
+    question = payload["messages"][-1]["content"]
+    prompt_tokens = sum(len(m["content"]) for m in payload["messages"]) // 4
+    if "Test koneksi" in question:
+        content = "Koneksi berhasil."
+    else:
+        content = f"Jawaban stub untuk prompt sepanjang {len(question)} karakter."
+    if payload.get("stream"):
+        return StreamingResponse(_stream_chunks(payload.get("model", "stub"), content), media_type="text/event-stream")
+    return _completion_body(payload.get("model", "stub"), content, prompt_tokens)
+
+
+async def _stream_chunks(model: str, content: str):
+    """Mengirim jawaban kata demi kata dalam format chunk SSE OpenAI."""
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+    for i, word in enumerate(content.split(" ")):
+        chunk = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": {"content": word if i == 0 else " " + word}, "finish_reason": None}],
+        }
+        yield f"data: {json.dumps(chunk)}\n\n"
+        await asyncio.sleep(settings["token_delay"])
+    yield "data: [DONE]\n\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--delay", type=float, default=0.0, help="Latensi buatan per permintaan (detik)")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="Jeda antar kata pada mode stream (detik)")
+    parser.add_argument("--status", type=int, default=200, help="Paksa status HTTP tertentu, misalnya 429 atau 503")
+    args = parser.parse_args()
+
+    settings["delay"] = args.delay
+    settings["status"] = args.status
+    settings["token_delay"] = args.token_delay
+    uvicorn.run(stub_app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
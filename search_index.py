@@ -0,0 +1,665 @@
+"""
+Indeks terbalik (inverted index) untuk pencarian teks penuh di semua dokumen.
+
+Indeks menyimpan posting per term: chunk mana yang memuat term tersebut dan
+berapa kali. Skor dihitung dengan BM25 per chunk (seperti retrieval.py), lalu
+dokumen diurutkan berdasarkan chunk terbaiknya.
+
+Penyimpanan berbentuk satu segmen di disk ditambah delta di memori:
+
+- Segmen adalah folder berisi file biner yang di-memory-map saat dibuka, sehingga
+  startup tidak perlu membaca seluruh indeks dan memori dibagi dengan page cache OS.
+  Daftar term terurut (dicari dengan binary search), posting (chunk, frekuensi),
+  dan tabel chunk (dokumen, nomor chunk, halaman, panjang).
+- Dokumen baru masuk ke delta di memori; dokumen segmen yang dihapus ditandai
+  (tombstone) dan dilewati saat pencarian.
+- merge() menulis segmen baru berisi segmen lama + delta tanpa tombstone, lalu
+  menggantinya secara atomik lewat file CURRENT. Delta yang belum di-merge hilang
+  saat proses berhenti, sehingga pemanggil menyelaraskan ulang indeks dengan
+  database saat startup.
+
+Beberapa proses worker boleh memakai folder yang sama. Setiap proses memiliki
+delta sendiri; merge dan penghapusan segmen dilakukan di bawah file lock, dan
+merge selalu dibangun di atas segmen terbaru di disk. refresh() membuka segmen
+yang ditulis proses lain. Setiap proses mencatat segmen yang sedang dibacanya di
+folder readers/, dan segmen hanya dihapus bila tidak lagi tercatat di sana.
+Dokumen di delta proses lain baru terlihat setelah proses itu melakukan merge,
+sehingga pemanggil sebaiknya juga menyelaraskan indeks dengan database secara berkala.
+
+File biner memakai urutan byte mesin ini (indeks bersifat lokal, bukan format pertukaran).
+"""
+import json
+import math
+import mmap
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from retrieval import tokenize
+
+try:
+    import fcntl
+except ImportError: # Windows
+    fcntl = None
+    import msvcrt
+
+_CURRENT_FILE = "CURRENT"
+_LOCK_FILE = "LOCK"
+_READERS_DIR = "readers"
+# Per chunk: urutan dokumen, nomor chunk, halaman + 1 (0 = tanpa halaman), panjang (jumlah term)
+_CHUNK_FIELDS = 4
+# Per term: offset dan panjang teks term di terms.dat, offset (dalam pasangan) dan jumlah posting
+_TERM_FIELDS = 4
+
+
+@dataclass
+class IndexedChunk:
+    """Data chunk yang dibutuhkan indeks; Chunk dari retrieval.py juga memenuhi bentuk ini."""
+    chunk_index: int
+    page_number: Optional[int]
+    term_freqs: Dict[str, int]
+
+
+@dataclass
+class SearchHit:
+    """Satu dokumen hasil pencarian beserta chunk terbaiknya (chunk_index, halaman, skor)."""
+    document_id: str
+    score: float
+    matched_terms: int
+    chunks: List[Tuple[int, Optional[int], float]] = field(default_factory=list)
+
+
+def _map_file(path: str):
+    """Memory-map file baca-saja; file kosong (tidak bisa di-mmap) menjadi bytes kosong."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class _FileLock:
+    """Kunci eksklusif antarproses pada sebuah file; dilepas otomatis oleh OS bila proses mati."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT)
+        while True:
+            try:
+                if fcntl:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                self._fd = fd
+                return True
+            except OSError:
+                if not blocking:
+                    os.close(fd)
+                    return False
+                time.sleep(0.05)
+
+    def release(self):
+        if self._fd is None:
+            return
+        try:
+            if fcntl:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class _Segment:
+    """Segmen indeks baca-saja yang di-memory-map dari satu folder."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(os.path.join(path, "docs.json"), "r", encoding="utf-8") as f:
+            self.doc_ids: List[str] = json.load(f)
+        self.doc_ordinals = {doc_id: i for i, doc_id in enumerate(self.doc_ids)}
+        self.chunk_count = meta["chunks"]
+        self.total_length = meta["total_length"]
+        self.term_count = meta["terms"]
+
+        self._maps = [_map_file(os.path.join(path, name)) for name in ("chunks.bin", "terms.idx", "terms.dat", "postings.bin")]
+        chunks, terms_idx, self.terms_dat, postings = self._maps
+        self.chunks = memoryview(chunks).cast("I")
+        self.terms_idx = memoryview(terms_idx).cast("Q")
+        self.postings = memoryview(postings).cast("I")
+
+    @classmethod
+    def empty(cls) -> "_Segment":
+        segment = cls.__new__(cls)
+        segment.path = None
+        segment.doc_ids, segment.doc_ordinals = [], {}
+        segment.chunk_count = segment.total_length = segment.term_count = 0
+        segment.chunks = segment.terms_idx = segment.postings = memoryview(b"").cast("I")
+        segment.terms_dat = b""
+        return segment
+
+    def _term_at(self, i: int) -> bytes:
+        offset, length = self.terms_idx[i * _TERM_FIELDS], self.terms_idx[i * _TERM_FIELDS + 1]
+        return self.terms_dat[offset:offset + length]
+
+    def lookup(self, term: str) -> Tuple[int, int]:
+        """Binary search term; mengembalikan (offset pasangan posting, jumlah posting), (0, 0) jika tidak ada."""
+        key = term.encode("utf-8")
+        low, high = 0, self.term_count
+        while low < high:
+            mid = (low + high) // 2
+            if self._term_at(mid) < key:
+                low = mid + 1
+            else:
+                high = mid
+        if low < self.term_count and self._term_at(low) == key:
+            return self.terms_idx[low * _TERM_FIELDS + 2], self.terms_idx[low * _TERM_FIELDS + 3]
+        return 0, 0
+
+    def frequency(self, offset: int, count: int, ordinal: int) -> int:
+        """Frekuensi term di satu chunk; posting sebuah term terurut menurut ordinal chunk."""
+        low, high = offset, offset + count
+        while low < high:
+            mid = (low + high) // 2
+            if self.postings[mid * 2] < ordinal:
+                low = mid + 1
+            else:
+                high = mid
+        if low < offset + count and self.postings[low * 2] == ordinal:
+            return self.postings[low * 2 + 1]
+        return 0
+
+    def iter_terms(self) -> Iterable[Tuple[str, int, int]]:
+        """Semua (term, offset posting, jumlah posting) dalam urutan byte UTF-8."""
+        for i in range(self.term_count):
+            yield (self._term_at(i).decode("utf-8"),
+                   self.terms_idx[i * _TERM_FIELDS + 2], self.terms_idx[i * _TERM_FIELDS + 3])
+
+
+def _write_segment(path: str, doc_ids: List[str], chunks: array, postings_by_term: Iterable[Tuple[bytes, array]], total_length: int):
+    """Menulis segmen ke folder baru `path`; postings_by_term harus terurut menurut term (bytes)."""
+    os.makedirs(path)
+    terms_idx = array("Q")
+    term_count = 0
+    with open(os.path.join(path, "terms.dat"), "wb") as terms_dat, open(os.path.join(path, "postings.bin"), "wb") as postings_bin:
+        term_offset, posting_offset = 0, 0
+        for term, postings in postings_by_term:
+            if not postings:
+                continue
+            terms_dat.write(term)
+            postings_bin.write(postings.tobytes())
+            pair_count = len(postings) // 2
+            terms_idx.extend((term_offset, len(term), posting_offset, pair_count))
+            term_offset += len(term)
+            posting_offset += pair_count
+            term_count += 1
+    with open(os.path.join(path, "terms.idx"), "wb") as f:
+        f.write(terms_idx.tobytes())
+    with open(os.path.join(path, "chunks.bin"), "wb") as f:
+        f.write(chunks.tobytes())
+    with open(os.path.join(path, "docs.json"), "w", encoding="utf-8") as f:
+        json.dump(doc_ids, f)
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"chunks": len(chunks) // _CHUNK_FIELDS, "total_length": total_length, "terms": term_count}, f)
+
+
+class _Delta:
+    """Chunk yang belum masuk segmen, dengan posting di memori."""
+
+    def __init__(self):
+        # Chunk: (id dokumen, nomor chunk, halaman, panjang); posting: term -> [(id chunk, frekuensi)]
+        self.chunks: List[Tuple[str, int, Optional[int], int]] = []
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        self.docs: Set[str] = set()
+        self.length = 0
+
+    def add(self, document_id: str, chunks: Iterable[Tuple[int, Optional[int], Dict[str, int]]]):
+        self.docs.add(document_id)
+        for chunk_index, page_number, term_freqs in chunks:
+            chunk_id = len(self.chunks)
+            length = sum(term_freqs.values())
+            self.chunks.append((document_id, chunk_index, page_number, length))
+            self.length += length
+            for term, freq in term_freqs.items():
+                self.postings.setdefault(term, []).append((chunk_id, freq))
+
+    def documents(self) -> Dict[str, List[Tuple[int, Optional[int], Dict[str, int]]]]:
+        """Isi delta per dokumen, dalam bentuk yang diterima add()."""
+        term_freqs: List[Dict[str, int]] = [{} for _ in self.chunks]
+        for term, postings in self.postings.items():
+            for chunk_id, freq in postings:
+                term_freqs[chunk_id][term] = freq
+        documents: Dict[str, List[Tuple[int, Optional[int], Dict[str, int]]]] = {}
+        for (doc_id, chunk_index, page, _), freqs in zip(self.chunks, term_freqs):
+            documents.setdefault(doc_id, []).append((chunk_index, page, freqs))
+        return documents
+
+    def drop(self, document_id: str):
+        """Membuang dokumen dengan membangun ulang delta (jarang terjadi, delta berukuran kecil)."""
+        documents = self.documents()
+        documents.pop(document_id, None)
+        self.__init__()
+        for doc_id, chunks in documents.items():
+            self.add(doc_id, chunks)
+
+
+class SearchIndex:
+    """
+    Indeks pencarian teks penuh yang aman dipakai dari banyak thread.
+
+    Args:
+        directory: Folder indeks (dibuat bila belum ada)
+        merge_threshold: Jumlah chunk di delta yang memicu merge ke segmen baru
+        reader_ttl: Detik sejak catatan pembaca terakhir diperbarui sebelum dianggap milik
+            proses yang sudah mati; refresh() harus dipanggil lebih sering dari ini
+        common_term_ratio, common_term_min: Term yang muncul di lebih dari rasio ini dari
+            semua chunk (dan lebih dari common_term_min chunk) dianggap sangat umum
+        k1, b: Parameter BM25
+    """
+
+    def __init__(self, directory: str, merge_threshold: int = 20000, reader_ttl: float = 600.0,
+                 common_term_ratio: float = 0.05, common_term_min: int = 1000, k1: float = 1.5, b: float = 0.75):
+        self.directory = directory
+        self.merge_threshold = merge_threshold
+        self.reader_ttl = reader_ttl
+        self.common_term_ratio = common_term_ratio
+        self.common_term_min = common_term_min
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._merge_lock = threading.Lock()
+        self._segment = _Segment.empty()
+        self._current: Optional[str] = None # Nama segmen yang sedang dibuka
+        self._dead_ordinals: Set[int] = set() # Dokumen segmen yang dihapus atau diganti
+        # Dokumen yang dihapus di proses ini, agar tetap tersembunyi di segmen yang ditulis proses lain
+        self._deleted: Set[str] = set()
+        self._reader_file = os.path.join(directory, _READERS_DIR, f"{os.getpid()}-{uuid.uuid4().hex[:8]}")
+        self._delta = _Delta()
+        # Delta yang sedang ditulis ke segmen baru oleh merge, dan dokumen yang dihapus/diganti sejak merge dimulai
+        self._merging = _Delta()
+        self._removed: Set[str] = set()
+
+    def _dir_lock(self) -> _FileLock:
+        os.makedirs(os.path.join(self.directory, _READERS_DIR), exist_ok=True)
+        return _FileLock(os.path.join(self.directory, _LOCK_FILE))
+
+    def open(self):
+        """Membuka segmen terakhir di disk (jika ada) dan menghapus segmen lama yang tidak lagi dibaca proses mana pun."""
+        with self._dir_lock():
+            self._load_current(force=True)
+            self._remove_stale_segments()
+
+    def refresh(self) -> bool:
+        """
+        Beralih ke segmen terbaru bila proses lain telah melakukan merge, dan memperbarui
+        catatan pembaca proses ini. Tidak menunggu bila folder sedang dikunci merge.
+
+        Returns:
+            True jika segmen baru dibuka
+        """
+        lock = self._dir_lock()
+        if not lock.acquire(blocking=False):
+            # Merge proses lain sedang berjalan; cukup tandai bahwa proses ini masih hidup
+            try:
+                os.utime(self._reader_file)
+            except OSError:
+                pass
+            return False
+        try:
+            return self._load_current()
+        finally:
+            lock.release()
+
+    def close(self):
+        """Menghapus catatan pembaca proses ini agar segmennya boleh dihapus proses lain."""
+        try:
+            os.remove(self._reader_file)
+        except OSError:
+            pass
+
+    def _load_current(self, force: bool = False) -> bool:
+        """Membuka segmen yang ditunjuk CURRENT bila berbeda dari yang sedang dibuka. Dipanggil di bawah file lock."""
+        current = None
+        try:
+            with open(os.path.join(self.directory, _CURRENT_FILE), "r", encoding="utf-8") as f:
+                current = f.read().strip() or None
+        except FileNotFoundError:
+            pass
+
+        changed = force or current != self._current
+        if changed:
+            segment = _Segment.empty()
+            if current:
+                try:
+                    segment = _Segment(os.path.join(self.directory, current))
+                except (OSError, ValueError) as e:
+                    print(f"Segmen indeks pencarian '{current}' tidak dapat dibuka, indeks dibangun ulang: {e}")
+                    current = None
+            with self._lock:
+                # Isi delta proses ini lebih baru daripada segmen yang ditulis proses lain
+                hidden = self._delta.docs | self._merging.docs | self._deleted
+                self._segment = segment
+                self._current = current
+                self._dead_ordinals = {segment.doc_ordinals[doc_id] for doc_id in hidden if doc_id in segment.doc_ordinals}
+                self._deleted &= segment.doc_ordinals.keys()
+        self._write_reader_file()
+        return changed
+
+    def _write_reader_file(self):
+        tmp_path = f"{self._reader_file}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self._current or "")
+        os.replace(tmp_path, self._reader_file)
+
+    def _remove_stale_segments(self):
+        """Menghapus segmen selain CURRENT yang tidak dibaca proses mana pun. Dipanggil di bawah file lock."""
+        keep = {self._current}
+        readers = os.path.join(self.directory, _READERS_DIR)
+        now = time.time()
+        for name in os.listdir(readers):
+            path = os.path.join(readers, name)
+            try:
+                if now - os.path.getmtime(path) > self.reader_ttl:
+                    os.remove(path) # Proses yang sudah mati tanpa sempat menutup indeks
+                    continue
+                with open(path, "r", encoding="utf-8") as f:
+                    keep.add(f.read().strip())
+            except OSError:
+                continue
+        for name in os.listdir(self.directory):
+            if name.startswith("seg-") and name not in keep:
+                # Di Windows folder yang masih di-mmap gagal dihapus; dicoba lagi pada merge berikutnya
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def add_document(self, document_id: str, chunks: Sequence[IndexedChunk]):
+        """Menambahkan semua chunk sebuah dokumen; versi lama dokumen yang sama diganti."""
+        with self._lock:
+            self._remove_locked(document_id)
+            self._deleted.discard(document_id)
+            self._delta.add(document_id, [(chunk.chunk_index, chunk.page_number, chunk.term_freqs) for chunk in chunks])
+            should_merge = len(self._delta.chunks) >= self.merge_threshold
+        if should_merge:
+            self.merge()
+
+    def remove_document(self, document_id: str):
+        """Menghapus dokumen dari hasil pencarian; postingnya dibuang dari disk pada merge berikutnya."""
+        with self._lock:
+            self._remove_locked(document_id)
+            self._deleted.add(document_id)
+
+    def _remove_locked(self, document_id: str):
+        ordinal = self._segment.doc_ordinals.get(document_id)
+        if ordinal is not None:
+            self._dead_ordinals.add(ordinal)
+        if document_id in self._delta.docs:
+            self._delta.drop(document_id)
+        # Dicatat untuk merge yang sedang berjalan: segmen barunya ditulis dari keadaan sebelum penghapusan ini
+        self._removed.add(document_id)
+
+    def document_ids(self) -> Set[str]:
+        """ID dokumen yang saat ini terindeks (tanpa yang sudah dihapus)."""
+        with self._lock:
+            return self._document_ids_locked()
+
+    def _document_ids_locked(self) -> Set[str]:
+        segment_docs = {doc_id for i, doc_id in enumerate(self._segment.doc_ids) if i not in self._dead_ordinals}
+        return segment_docs | (self._merging.docs - self._removed) | self._delta.docs
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "documents": len(self._document_ids_locked()),
+                "segment_chunks": self._segment.chunk_count,
+                "segment_terms": self._segment.term_count,
+                "delta_chunks": len(self._delta.chunks) + len(self._merging.chunks),
+            }
+
+    def search(self, query: str, limit: int = 20, chunks_per_doc: int = 3) -> List[SearchHit]:
+        """
+        Mencari dokumen yang memuat term-term pertanyaan.
+
+        Term diproses dari yang paling jarang. Term yang sangat umum hanya menambah skor
+        chunk yang sudah cocok dengan term lain, sehingga posting panjangnya tidak ditelusuri;
+        chunk yang hanya memuat term umum itu tidak ikut dalam hasil.
+
+        Returns:
+            Paling banyak `limit` SearchHit, terurut dari jumlah term yang cocok lalu skor.
+            Skor dokumen adalah skor BM25 chunk terbaiknya; `chunks` berisi
+            `chunks_per_doc` chunk terbaik sebagai (nomor chunk, halaman, skor).
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        with self._lock:
+            segment = self._segment
+            dead = set(self._dead_ordinals)
+            # Posting delta disalin per term agar penambahan berikutnya tidak mengubah hasil di tengah jalan
+            deltas = [
+                (delta.chunks[:], {term: delta.postings.get(term, [])[:] for term in terms}, excluded, delta.length)
+                for delta, excluded in ((self._merging, set(self._removed)), (self._delta, set()))
+            ]
+
+        chunk_count = segment.chunk_count + sum(len(chunks) for chunks, _, _, _ in deltas)
+        if not chunk_count:
+            return []
+        avg_length = (segment.total_length + sum(length for _, _, _, length in deltas)) / chunk_count or 1.0
+        k1, b = self.k1, self.b
+        seg_chunks, seg_postings = segment.chunks, segment.postings
+
+        # Skor per chunk: kunci (0, ordinal segmen) atau (1 + nomor delta, id chunk delta)
+        chunk_scores: Dict[Tuple[int, int], float] = {}
+        doc_terms: Dict[str, Set[str]] = {}
+        term_postings = []
+        for term in terms:
+            offset, count = segment.lookup(term)
+            df = count + sum(len(postings[term]) for _, postings, _, _ in deltas)
+            if df:
+                term_postings.append((df, term, offset, count))
+        term_postings.sort()
+        common_df = max(self.common_term_min, int(chunk_count * self.common_term_ratio))
+
+        for df, term, offset, count in term_postings:
+            idf = math.log(1 + (chunk_count - df + 0.5) / (df + 0.5))
+
+            if df > common_df and chunk_scores:
+                delta_freqs = [dict(postings[term]) for _, postings, _, _ in deltas]
+                for key in list(chunk_scores):
+                    source, position = key
+                    if source == 0:
+                        base = position * _CHUNK_FIELDS
+                        freq = segment.frequency(offset, count, position)
+                        doc_id, length = segment.doc_ids[seg_chunks[base]], seg_chunks[base + 3]
+                    else:
+                        freq = delta_freqs[source - 1].get(position, 0)
+                        doc_id, _, _, length = deltas[source - 1][0][position]
+                    if freq:
+                        norm = k1 * (1 - b + b * length / avg_length)
+                        chunk_scores[key] += idf * freq * (k1 + 1) / (freq + norm)
+                        doc_terms[doc_id].add(term)
+                continue
+
+            for i in range(offset * 2, (offset + count) * 2, 2):
+                ordinal = seg_postings[i]
+                base = ordinal * _CHUNK_FIELDS
+                doc_ordinal = seg_chunks[base]
+                if doc_ordinal in dead:
+                    continue
+                freq = seg_postings[i + 1]
+                norm = k1 * (1 - b + b * seg_chunks[base + 3] / avg_length)
+                key = (0, ordinal)
+                chunk_scores[key] = chunk_scores.get(key, 0.0) + idf * freq * (k1 + 1) / (freq + norm)
+                doc_terms.setdefault(segment.doc_ids[doc_ordinal], set()).add(term)
+
+            for delta_number, (chunks, postings, excluded, _) in enumerate(deltas, start=1):
+                for chunk_id, freq in postings[term]:
+                    doc_id, _, _, length = chunks[chunk_id]
+                    if doc_id in excluded:
+                        continue
+                    norm = k1 * (1 - b + b * length / avg_length)
+                    key = (delta_number, chunk_id)
+                    chunk_scores[key] = chunk_scores.get(key, 0.0) + idf * freq * (k1 + 1) / (freq + norm)
+                    doc_terms.setdefault(doc_id, set()).add(term)
+
+        by_doc: Dict[str, List[Tuple[int, Optional[int], float]]] = {}
+        for (source, position), score in chunk_scores.items():
+            if source == 0:
+                base = position * _CHUNK_FIELDS
+                doc_id = segment.doc_ids[seg_chunks[base]]
+                page = seg_chunks[base + 2] - 1 if seg_chunks[base + 2] else None
+                chunk_index = seg_chunks[base + 1]
+            else:
+                doc_id, chunk_index, page, _ = deltas[source - 1][0][position]
+            by_doc.setdefault(doc_id, []).append((chunk_index, page, score))
+
+        hits = []
+        for doc_id, chunks in by_doc.items():
+            chunks.sort(key=lambda chunk: chunk[2], reverse=True)
+            hits.append(SearchHit(doc_id, chunks[0][2], len(doc_terms[doc_id]), chunks[:chunks_per_doc]))
+        hits.sort(key=lambda hit: (hit.matched_terms, hit.score), reverse=True)
+        return hits[:limit]
+
+    def merge(self) -> bool:
+        """
+        Menulis segmen baru berisi segmen terbaru di disk dan delta proses ini, tanpa dokumen
+        yang dihapus. Pencarian, penambahan, dan penghapusan tetap berjalan selama segmen
+        ditulis; merge proses lain menunggu sampai selesai.
+
+        Returns:
+            True jika segmen baru ditulis, False jika tidak ada perubahan
+        """
+        with self._merge_lock, self._dir_lock():
+            self._load_current()
+            with self._lock:
+                segment = self._segment
+                dead = set(self._dead_ordinals)
+                if not self._delta.chunks and not dead:
+                    return False
+                merging = self._merging = self._delta
+                self._delta = _Delta()
+                self._removed = set()
+
+            name = f"seg-{uuid.uuid4().hex}"
+            try:
+                new_segment = self._write_merged(name, segment, dead, merging)
+            except Exception:
+                with self._lock:
+                    # Delta yang gagal ditulis dikembalikan (tanpa dokumen yang dihapus/diganti sementara itu)
+                    documents = merging.documents()
+                    for doc_id in self._removed | self._delta.docs:
+                        documents.pop(doc_id, None)
+                    documents.update(self._delta.documents())
+                    self._delta = _Delta()
+                    for doc_id, chunks in documents.items():
+                        self._delta.add(doc_id, chunks)
+                    self._merging = _Delta()
+                    self._removed = set()
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+                raise
+
+            tmp_current = os.path.join(self.directory, f"{_CURRENT_FILE}.{uuid.uuid4().hex}.tmp")
+            with open(tmp_current, "w", encoding="utf-8") as f:
+                f.write(name)
+            os.replace(tmp_current, os.path.join(self.directory, _CURRENT_FILE))
+
+            with self._lock:
+                # Dokumen yang dihapus atau diganti selama merge tidak boleh muncul dari segmen baru
+                self._segment = new_segment
+                self._current = name
+                self._dead_ordinals = {
+                    new_segment.doc_ordinals[doc_id] for doc_id in self._removed | self._delta.docs
+                    if doc_id in new_segment.doc_ordinals
+                }
+                self._merging = _Delta()
+                self._removed = set()
+                self._deleted &= new_segment.doc_ordinals.keys()
+            self._write_reader_file()
+            self._remove_stale_segments()
+            return True
+
+    def _write_merged(self, name: str, segment: _Segment, dead: Set[int], merging: _Delta) -> _Segment:
+        """Menulis gabungan segmen (tanpa dokumen mati) dan delta ke folder `name`, lalu membukanya."""
+        # Nomor urut baru: chunk segmen yang masih hidup, lalu chunk delta
+        doc_ids: List[str] = []
+        doc_ordinals: Dict[str, int] = {}
+        chunks = array("I")
+        segment_map: Dict[int, int] = {}
+        delta_map: Dict[int, int] = {}
+        total_length = 0
+
+        def add_chunk(doc_id, chunk_index, page, length) -> int:
+            nonlocal total_length
+            if doc_id not in doc_ordinals:
+                doc_ordinals[doc_id] = len(doc_ids)
+                doc_ids.append(doc_id)
+            chunks.extend((doc_ordinals[doc_id], chunk_index, 0 if page is None else page + 1, length))
+            total_length += length
+            return len(chunks) // _CHUNK_FIELDS - 1
+
+        for ordinal in range(segment.chunk_count):
+            base = ordinal * _CHUNK_FIELDS
+            if segment.chunks[base] not in dead:
+                page = segment.chunks[base + 2] - 1 if segment.chunks[base + 2] else None
+                segment_map[ordinal] = add_chunk(segment.doc_ids[segment.chunks[base]], segment.chunks[base + 1], page, segment.chunks[base + 3])
+        for chunk_id, (doc_id, chunk_index, page, length) in enumerate(merging.chunks):
+            delta_map[chunk_id] = add_chunk(doc_id, chunk_index, page, length)
+
+        segment_terms = {term: (offset, count) for term, offset, count in segment.iter_terms()}
+        all_terms = sorted({term.encode("utf-8") for term in segment_terms} | {term.encode("utf-8") for term in merging.postings})
+
+        def postings_by_term():
+            for term_bytes in all_terms:
+                term = term_bytes.decode("utf-8")
+                postings = array("I")
+                offset, count = segment_terms.get(term, (0, 0))
+                for i in range(offset * 2, (offset + count) * 2, 2):
+                    new_ordinal = segment_map.get(segment.postings[i])
+                    if new_ordinal is not None:
+                        postings.extend((new_ordinal, segment.postings[i + 1]))
+                for chunk_id, freq in merging.postings.get(term, ()):
+                    postings.extend((delta_map[chunk_id], freq))
+                yield term_bytes, postings
+
+        path = os.path.join(self.directory, name)
+        _write_segment(path, doc_ids, chunks, postings_by_term(), total_length)
+        return _Segment(path)
+
+
+def make_snippet(content: str, query: str, width: int = 200) -> str:
+    """
+    Potongan teks sekitar kemunculan pertama term pertanyaan, paling panjang `width` karakter.
+    Jika tidak ada term yang cocok, awal teks yang dipakai.
+    """
+    text = " ".join(content.split())
+    terms = sorted(set(tokenize(query)), key=len, reverse=True)
+    match = re.search(r"\b(" + "|".join(re.escape(term) for term in terms) + r")\b", text, re.IGNORECASE) if terms else None
+    if len(text) <= width:
+        return text
+    center = match.start() if match else 0
+    start = max(0, min(center - width // 3, len(text) - width))
+    end = start + width
+    # Potong pada batas kata
+    if start > 0:
+        start = text.find(" ", start) + 1 or start
+    if end < len(text):
+        end = text.rfind(" ", start, end) if text.rfind(" ", start, end) > start else end
+    return ("..." if start > 0 else "") + text[start:end] + ("..." if end < len(text) else "")
@@ -69,7 +69,9 @@ python-multipart==0.0.6
 pydantic[email]==2.5.0
 python-docx==1.1.0
 PyPDF2==3.0.1
+PyMuPDF
 requests==2.31.0
+httpx
 python-dotenv==1.0.0
 pymysql
 sqlalchemy
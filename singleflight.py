@@ -0,0 +1,113 @@
+"""
+Penggabungan panggilan identik yang sedang berjalan (single-flight).
+
+Bila banyak permintaan dengan kunci yang sama datang bersamaan, hanya
+permintaan pertama yang benar-benar memanggil layanan; sisanya menunggu dan
+menerima hasil yang sama. Untuk streaming, potongan yang sudah diterima
+diputar ulang ke pelanggan yang bergabung belakangan, lalu potongan berikutnya
+diteruskan ke semua pelanggan. Panggilan dijalankan sebagai task tersendiri,
+sehingga pembatalan satu permintaan (misalnya klien terputus) tidak
+membatalkan hasil untuk permintaan lain. Penggabungan berlaku per proses.
+"""
+import asyncio
+import hashlib
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+
+def flight_key(*parts: Any) -> str:
+    """Kunci single-flight dari bagian-bagian permintaan; spasi berlebih pada teks diabaikan."""
+    normalized = [" ".join(part.split()) if isinstance(part, str) else part for part in parts]
+    return hashlib.sha256(json.dumps(normalized).encode("utf-8")).hexdigest()
+
+
+class _Broadcast:
+    """Potongan hasil streaming yang dibagikan ke semua pelanggan satu kunci."""
+
+    def __init__(self):
+        self.items: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.changed = asyncio.Condition()
+
+    async def publish(self, item: Any = None, finished: bool = False):
+        async with self.changed:
+            if finished:
+                self.done = True
+            else:
+                self.items.append(item)
+            self.changed.notify_all()
+
+
+class SingleFlight:
+    """
+    Menggabungkan panggilan async identik yang sedang berjalan dalam satu proses.
+
+    Args:
+        on_shared: Callback (mode) setiap kali permintaan menumpang panggilan yang sudah berjalan
+    """
+
+    def __init__(self, on_shared: Optional[Callable[[str], None]] = None):
+        self._calls: Dict[str, asyncio.Future] = {}
+        self._streams: Dict[str, _Broadcast] = {}
+        self._pumps = set()  # Referensi task streaming agar tidak dibersihkan sebelum selesai
+        self._on_shared = on_shared
+
+    def in_flight(self) -> int:
+        return len(self._calls) + len(self._streams)
+
+    def _shared(self, mode: str):
+        if self._on_shared:
+            self._on_shared(mode)
+
+    async def do(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Menjalankan call() sekali untuk semua pemanggil dengan kunci sama yang datang selama call berjalan."""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        else:
+            self._shared("complete")
+        return await asyncio.shield(task)
+
+    async def stream(self, key: str, open_stream: Callable[[], AsyncIterator[Any]]) -> AsyncIterator[Any]:
+        """
+        Mengalirkan hasil open_stream() yang dibagikan ke semua pemanggil dengan kunci sama.
+
+        Pelanggan yang bergabung belakangan menerima potongan yang terlewat lebih dulu.
+        Exception dari sumber dilempar ulang ke setiap pelanggan setelah potongan terakhirnya.
+        """
+        broadcast = self._streams.get(key)
+        if broadcast is None:
+            broadcast = self._streams[key] = _Broadcast()
+            task = asyncio.ensure_future(self._pump(key, broadcast, open_stream))
+            self._pumps.add(task)
+            task.add_done_callback(self._pumps.discard)
+        else:
+            self._shared("stream")
+
+        position = 0
+        while True:
+            async with broadcast.changed:
+                await broadcast.changed.wait_for(lambda: len(broadcast.items) > position or broadcast.done)
+                items = broadcast.items[position:]
+                finished = broadcast.done
+            for item in items:
+                yield item
+            position += len(items)
+            if finished and position >= len(broadcast.items):
+                if broadcast.error is not None:
+                    raise broadcast.error
+                return
+
+    async def _pump(self, key: str, broadcast: _Broadcast, open_stream: Callable[[], AsyncIterator[Any]]):
+        try:
+            async for item in open_stream():
+                await broadcast.publish(item)
+        except Exception as e:
+            broadcast.error = e
+        finally:
+            # Permintaan baru setelah ini memulai panggilan sendiri
+            self._streams.pop(key, None)
+            await broadcast.publish(finished=True)
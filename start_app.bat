@@ -4,19 +4,14 @@ echo.
 
 REM Pastikan MySQL berjalan dengan baik
 echo Memeriksa koneksi MySQL...
-python -c "from db_utils import check_mysql_connection; print('MySQL OK' if check_mysql_connection() else 'MySQL Error')"
-
-REM Jika ada masalah dengan MySQL, coba bersihkan koneksi
-echo Membersihkan koneksi MySQL yang menggantung...
-python -c "from db_utils import cleanup_mysql_connections; cleanup_mysql_connections()"
+python -c "import os; from dotenv import load_dotenv; load_dotenv(); from db_utils import check_database_connection; print('MySQL OK' if check_database_connection(os.getenv('DATABASE_URL')) else 'MySQL Error')"
 
 echo.
 echo Memulai aplikasi...
 python app.py
 
 echo.
-echo Aplikasi berhenti. Membersihkan koneksi...
-python -c "from db_utils import cleanup_mysql_connections; cleanup_mysql_connections()"
+echo Aplikasi berhenti. Koneksi database sudah ditutup oleh aplikasi.
 
 echo.
 echo Selesai!
@@ -0,0 +1,46 @@
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from llm_scheduler import LLMScheduler
+
+
+class Transient(Exception):
+    pass
+
+
+def test_retry_after_slow_failure_is_not_rejected_by_queue_timeout():
+    # Panggilan pertama lebih lama dari max_wait lalu gagal; pengulangannya tetap harus dijalankan
+    scheduler = LLMScheduler(max_wait=0.5, max_retries=1, base_delay=0.0, is_retryable=lambda e: isinstance(e, Transient))
+    calls = []
+
+    async def call():
+        calls.append(1)
+        if len(calls) == 1:
+            await asyncio.sleep(0.6)
+            raise Transient()
+        return "ok"
+
+    assert asyncio.run(scheduler.run(call, tokens=1)) == "ok"
+    assert len(calls) == 2
+
+
+def test_stream_retry_after_slow_failure_is_not_rejected_by_queue_timeout():
+    scheduler = LLMScheduler(max_wait=0.5, max_retries=1, base_delay=0.0, is_retryable=lambda e: isinstance(e, Transient))
+    calls = []
+
+    async def open_stream():
+        calls.append(1)
+        if len(calls) == 1:
+            await asyncio.sleep(0.6)
+            raise Transient()
+        yield "a"
+        yield "b"
+
+    async def collect():
+        return [item async for item in scheduler.stream(open_stream, tokens=1)]
+
+    assert asyncio.run(collect()) == ["a", "b"]
+    assert len(calls) == 2
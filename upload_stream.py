@@ -0,0 +1,205 @@
+"""
+Penerima unggahan multipart yang menulis langsung ke disk.
+
+Badan permintaan diurai per potongan saat diterima, dan setiap berkas ditulis
+ke berkas sementara di folder tujuan sambil dihitung SHA-256 dan ukurannya.
+Tidak ada salinan kedua melalui SpooledTemporaryFile Starlette, dan batas
+ukuran diperiksa sejak byte pertama yang melewatinya, sehingga unggahan yang
+terlalu besar dihentikan tanpa harus diterima seluruhnya.
+"""
+import hashlib
+import os
+import uuid
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+
+class UploadError(Exception):
+    """Unggahan ditolak; status_code adalah kode HTTP yang sesuai."""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class MultipartUploadWriter:
+    """
+    Parser multipart inkremental yang menyimpan setiap bagian berkas ke dest_dir.
+
+    Args:
+        boundary: Boundary dari header Content-Type
+        dest_dir: Folder untuk berkas sementara (sebaiknya sama dengan folder akhir agar rename atomik)
+        max_file_size: Ukuran maksimum satu berkas (byte)
+        max_files: Jumlah maksimum berkas dalam satu permintaan
+        accept: Fungsi (nama berkas) -> bool; berkas yang ditolak dibuang tanpa ditulis
+        field_name: Nama field form yang berisi berkas
+    """
+
+    def __init__(
+        self,
+        boundary: bytes,
+        dest_dir: str,
+        max_file_size: int,
+        max_files: int,
+        accept: Optional[Callable[[str], bool]] = None,
+        field_name: str = "files",
+    ):
+        self.dest_dir = dest_dir
+        self.max_file_size = max_file_size
+        self.max_files = max_files
+        self.accept = accept or (lambda filename: True)
+        self.field_name = field_name
+
+        self.files: List[Dict[str, Any]] = []
+        self.skipped: List[str] = []
+        self._headers: Dict[str, bytes] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._current: Optional[Dict[str, Any]] = None
+        self._handle = None
+        self._sha256 = None
+        self._error: Optional[UploadError] = None
+
+        self._parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+
+    def _on_part_begin(self):
+        self._headers = {}
+        self._current = None
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        self._headers[self._header_field.lower().decode("latin-1")] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get("content-disposition", b""))
+        if b"filename" not in options or options.get(b"name", b"").decode("utf-8", "replace") != self.field_name:
+            return # Field biasa atau field lain diabaikan
+        # Hanya nama berkas yang dipakai; path dari klien (misalnya folder) dibuang
+        filename = Path(options[b"filename"].decode("utf-8", "replace").replace("\\", "/")).name
+        if not self.accept(filename):
+            self.skipped.append(filename)
+            return
+        if len(self.files) >= self.max_files:
+            raise UploadError(f"Maksimal {self.max_files} file diizinkan.")
+
+        tmp_path = os.path.join(self.dest_dir, f".{uuid.uuid4()}.part")
+        self._handle = open(tmp_path, "wb")
+        self._sha256 = hashlib.sha256()
+        self._current = {
+            "filename": filename,
+            "file_extension": Path(filename).suffix.lower().lstrip("."),
+            "tmp_path": tmp_path,
+            "content_hash": None,
+            "file_size": 0,
+        }
+        self.files.append(self._current)
+
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        if self._current is None:
+            return
+        size = self._current["file_size"] + (end - start)
+        if size > self.max_file_size:
+            limit_mb = self.max_file_size / (1024 * 1024)
+            raise UploadError(f"File '{self._current['filename']}' melebihi batas ukuran {limit_mb:g} MB.", status_code=413)
+        block = data[start:end]
+        self._sha256.update(block)
+        self._handle.write(block)
+        self._current["file_size"] = size
+
+    def _on_part_end(self):
+        if self._current is not None:
+            self._handle.close()
+            self._handle = None
+            self._current["content_hash"] = self._sha256.hexdigest()
+            self._current = None
+
+    def write(self, chunk: bytes):
+        """Mengurai satu potongan badan permintaan; UploadError dilempar jika batas terlampaui."""
+        if self._error:
+            raise self._error
+        try:
+            self._parser.write(chunk)
+        except UploadError as e:
+            self._error = e
+            raise
+        except Exception as e:
+            self._error = UploadError(f"Format unggahan tidak valid: {e}")
+            raise self._error
+
+    def finish(self) -> List[Dict[str, Any]]:
+        """Menutup parser dan mengembalikan berkas yang tersimpan lengkap."""
+        self._parser.finalize()
+        if self._current is not None:
+            raise UploadError("Unggahan terputus sebelum berkas selesai diterima.")
+        return self.files
+
+    def cleanup(self):
+        """Menghapus semua berkas sementara (dipanggil jika unggahan gagal)."""
+        if self._handle:
+            self._handle.close()
+            self._handle = None
+        for item in self.files:
+            if os.path.exists(item["tmp_path"]):
+                os.remove(item["tmp_path"])
+
+
+def parse_boundary(content_type: Optional[str]) -> bytes:
+    """Boundary dari header Content-Type multipart/form-data."""
+    media_type, options = parse_options_header(content_type or "")
+    if media_type != b"multipart/form-data" or b"boundary" not in options:
+        raise UploadError("Unggahan harus berupa multipart/form-data.")
+    return options[b"boundary"]
+
+
+async def receive_uploads(
+    stream: AsyncIterator[bytes],
+    writer: MultipartUploadWriter,
+    write: Optional[Callable[[Callable, bytes], Any]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Menerima seluruh badan permintaan ke writer.
+
+    Args:
+        stream: Potongan badan permintaan (misalnya request.stream())
+        writer: MultipartUploadWriter tujuan
+        write: Pemanggil async opsional (fungsi, potongan) untuk menjalankan penulisan di thread
+            lain, misalnya run_in_threadpool, agar event loop tidak terblokir I/O disk
+
+    Returns:
+        List[Dict]: Berkas tersimpan (filename, file_extension, tmp_path, content_hash, file_size)
+
+    Raises:
+        UploadError: Jika unggahan tidak valid atau melebihi batas; berkas sementara sudah dihapus.
+    """
+    try:
+        async for chunk in stream:
+            if not chunk:
+                continue
+            if write:
+                await write(writer.write, chunk)
+            else:
+                writer.write(chunk)
+        return writer.finish()
+    except BaseException:
+        writer.cleanup()
+        raise